@@ -0,0 +1,277 @@
+import sys
+import json
+import inspect
+import argparse
+import platform
+import tracemalloc
+from math import log
+from random import Random
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import modules.schedulers as schedulers
+import modules.memories as memories
+import modules.disk_schedulers as disk_schedulers
+from models import ProcessTable
+from modules import Simulator
+from modules.schedulers import Scheduler, FCFS, RoundRobin, SRTF, MLQ, MLFQ
+from modules.memories import Memory, Optimal
+from views import TableView
+from utils.workload_generator import WorkloadGenerator, PoissonArrivals, ExponentialBursts
+
+# Changing how inputs are generated or what is timed should bump this, so that results are not compared to stale baselines
+BENCHMARK_VERSION = 1
+SUITES = ("schedulers", "memories", "disks")
+DEFAULT_SIZES = [10 ** exponent for exponent in range(2, 8)]
+
+# Differences between times below this many seconds are mostly noise, so they are never counted as regressions
+NOISE_FLOOR = 0.005
+
+# Schedulers that need configuring are benchmarked with these factories, while the rest use their plain factory
+SCHEDULER_FACTORIES = {
+    RoundRobin: RoundRobin.factory(4, True),
+    MLQ: MLQ.factory([RoundRobin.factory(4), FCFS.factory(), SRTF.factory()]),
+    MLFQ: MLFQ.factory([4, 8], FCFS.factory()),
+}
+
+MEAN_BURST = 10
+# Processes arrive a little slower than they are served, so the processor is busy without the ready queue growing forever
+LOAD = 0.9
+DISK_BOUNDS = (0, 9999)
+
+# A benchmark prepares its input for a size, and returns a run that returns how many events it went through
+Benchmark = Tuple[str, str, Callable[[int], Callable[[], int]]]
+
+def create_processes(size: int, seed: int):
+    """ Generates a workload of processes spread over three queue levels. """
+    generator = WorkloadGenerator(PoissonArrivals(LOAD / MEAN_BURST), ExponentialBursts(MEAN_BURST), priorities={ p: 1 for p in range(1, 6) }, queue_levels={ 1: 1, 2: 1, 3: 1 }, seed=seed)
+    return ProcessTable.from_processes(generator.generate(size))
+
+def create_page_references(size: int, num_frames: int, seed: int):
+    """ Generates page references with locality, drawn from a working set that is a little larger than memory and that moves every so often. """
+    rng = Random(seed)
+    references: List[int] = []
+    base = 0
+    for time in range(size):
+        if time % 100 == 0:
+            base += rng.randrange(num_frames)
+        references.append(base + rng.randrange(num_frames * 2))
+
+    return references
+
+def create_tracks(size: int, seed: int):
+    """ Generates disk requests across the disk, where the first track is where the head starts. """
+    rng = Random(seed)
+    return [rng.randint(*DISK_BOUNDS) for _ in range(size)]
+
+def scheduler_benchmarks(seed: int) -> List[Benchmark]:
+    """ Benchmarks every scheduler by simulating a workload of each size, where the events are the steps of the simulation. """
+    benchmarks: List[Benchmark] = []
+    for name, scheduler in inspect.getmembers(schedulers, inspect.isclass):
+        if not issubclass(scheduler, Scheduler) or inspect.isabstract(scheduler):
+            continue
+        factory = SCHEDULER_FACTORIES.get(scheduler) or scheduler.factory()
+
+        def prepare(size: int, factory: Any = factory):
+            processes = create_processes(size, seed)
+            return lambda: Simulator(processes, factory).run().num_events
+
+        benchmarks.append(("schedulers", name, prepare))
+
+    return benchmarks
+
+def memory_benchmarks(seed: int, num_frames: int) -> List[Benchmark]:
+    """ Benchmarks every page replacement policy by loading a reference string of each size, where the events are the references. """
+    benchmarks: List[Benchmark] = []
+    for name, memory in inspect.getmembers(memories, inspect.isclass):
+        if not issubclass(memory, Memory) or inspect.isabstract(memory):
+            continue
+
+        def prepare(size: int, memory: Any = memory):
+            references = create_page_references(size, num_frames, seed)
+
+            def run():
+                # Optimal looks ahead at the references, so setting it up is part of its cost
+                instance = memory(num_frames, references) if memory == Optimal else memory(num_frames)
+                for page in references:
+                    instance.load(page)
+                return len(references)
+
+            return run
+
+        benchmarks.append(("memories", name, prepare))
+
+    return benchmarks
+
+def disk_benchmarks(seed: int) -> List[Benchmark]:
+    """ Benchmarks every disk scheduling algorithm by ordering requests of each size, where the events are the requests. """
+    benchmarks: List[Benchmark] = []
+    for name, algorithm in inspect.getmembers(disk_schedulers, inspect.isfunction):
+        def prepare(size: int, algorithm: Any = algorithm):
+            tracks = create_tracks(size, seed)
+            return lambda: len(algorithm(tracks, DISK_BOUNDS))
+
+        benchmarks.append(("disks", name, prepare))
+
+    return benchmarks
+
+def measure(prepare: Callable[[int], Callable[[], int]], size: int, repeat: int, track_memory: bool) -> Dict[str, Any]:
+    """
+        Times the best of a number of runs on a fresh input, so that the time is not thrown off by one slow run. The peak
+        memory is measured in a run of its own, since tracing allocations slows the run down.
+    """
+    best_seconds: Optional[float] = None
+    events = 0
+    for _ in range(repeat):
+        run = prepare(size)
+        start = perf_counter()
+        events = run()
+        seconds = perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+
+    peak_bytes: Optional[int] = None
+    if track_memory:
+        run = prepare(size)
+        tracemalloc.start()
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "seconds": best_seconds,
+        "peak_bytes": peak_bytes,
+        "events": events,
+        "events_per_second": events / best_seconds if best_seconds > 0 else None,
+    }
+
+def predict_seconds(previous: Optional[Tuple[int, float]], size: int, seconds: float, next_size: int):
+    """
+        Predicts how long a benchmark takes at the next size, from how its time grew since the previous size. It is
+        assumed to grow at least as fast as the size, and exactly as fast at the first size.
+    """
+    growth = 1.0
+    if previous is not None and previous[1] > 0 and size > previous[0]:
+        growth = max(growth, log(seconds / previous[1]) / log(size / previous[0]))
+
+    return seconds * (next_size / size) ** growth
+
+def run_benchmarks(benchmarks: List[Benchmark], sizes: List[int], repeat: int, time_limit: float, track_memory: bool):
+    """
+        Runs each benchmark on every size from the smallest, and returns the results. Once a run of a benchmark would go
+        past the time limit at the next size, its larger sizes are skipped, so that slow algorithms do not hold up the rest.
+    """
+    results: List[Dict[str, Any]] = []
+    sizes = sorted(sizes)
+    for suite, name, prepare in benchmarks:
+        previous: Optional[Tuple[int, float]] = None
+        for size, next_size in zip(sizes, sizes[1:] + [None]):
+            result = { "suite": suite, "name": name, "size": size, **measure(prepare, size, repeat, track_memory) }
+            results.append(result)
+            print("{}/{} n={}: {:.4f}s".format(suite, name, size, result["seconds"]), file=sys.stderr)
+
+            if next_size is not None and predict_seconds(previous, size, result["seconds"], next_size) > time_limit:
+                print("{}/{}: skipping the sizes after {}, which would go past the time limit".format(suite, name, size), file=sys.stderr)
+                break
+            previous = (size, result["seconds"])
+
+    return results
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float):
+    """ Pairs each result with the baseline of the same benchmark and size, and flags those that got slower by more than the threshold. """
+    baseline_seconds = { (r["suite"], r["name"], r["size"]): r["seconds"] for r in baseline }
+    comparisons = []
+    for result in results:
+        before = baseline_seconds.get((result["suite"], result["name"], result["size"]))
+        if before is None:
+            continue
+
+        change = (result["seconds"] - before) / before if before > 0 else 0.0
+        is_regression = change > threshold and result["seconds"] - before > NOISE_FLOOR
+        comparisons.append({ **result, "baseline_seconds": before, "change": change, "is_regression": is_regression })
+
+    return comparisons
+
+def print_results(results: List[Dict[str, Any]]):
+    table = TableView(min_cell_width=8, header=["Benchmark", "Size", "Seconds", "Events/s", "Peak KiB"])
+    for r in results:
+        peak = "{:.1f}".format(r["peak_bytes"] / 1024) if r["peak_bytes"] is not None else "--"
+        events_per_second = "{:.0f}".format(r["events_per_second"]) if r["events_per_second"] is not None else "--"
+        table.add_item("{}/{}".format(r["suite"], r["name"]), r["size"], "{:.4f}".format(r["seconds"]), events_per_second, peak)
+    table.render()
+
+def print_comparisons(comparisons: List[Dict[str, Any]]):
+    table = TableView(min_cell_width=8, header=["Benchmark", "Size", "Seconds", "Baseline", "Change", ""])
+    for c in comparisons:
+        table.add_item("{}/{}".format(c["suite"], c["name"]), c["size"], "{:.4f}".format(c["seconds"]), "{:.4f}".format(c["baseline_seconds"]), "{:+.1f}%".format(c["change"] * 100), "SLOWER" if c["is_regression"] else "")
+    table.render()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="benchmark.py",
+        description="Benchmarks the schedulers, page replacement policies, and disk scheduling algorithms on generated inputs of growing sizes.",
+    )
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES), help="suites to run (defaults to all of them)")
+    parser.add_argument("--only", nargs="+", default=[], metavar="NAME", help="only run the benchmarks with these names (e.g. LRU sstf MLFQ)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="input sizes to run each benchmark on (defaults to the powers of 10 from 100 up to 10000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs per size, of which the fastest is kept")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds that a run can be expected to take at the next size before the larger sizes of a benchmark are skipped")
+    parser.add_argument("--frames", type=int, default=64, help="number of memory frames of the page replacement benchmarks")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the generated inputs")
+    parser.add_argument("--no-memory", action="store_true", help="skip measuring the peak memory, which takes another run per size")
+    parser.add_argument("--output", metavar="PATH", help="write the results to a JSON file, which can be used as a baseline later")
+    parser.add_argument("--baseline", metavar="PATH", help="compare the results to those of an earlier run, exiting with 1 if any got slower")
+    parser.add_argument("--threshold", type=float, default=0.1, help="fraction that a benchmark can get slower by before it counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1 or args.frames < 1 or any(size < 1 for size in args.sizes):
+        parser.error("--repeat, --frames, and --sizes should be at least 1.")
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.baseline is not None:
+        try:
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as e:
+            parser.error("{}: {}".format(args.baseline, e))
+        if baseline.get("version") != BENCHMARK_VERSION:
+            parser.error("{}: the baseline was made by another version of the benchmarks.".format(args.baseline))
+        if baseline.get("frames") != args.frames or baseline.get("seed") != args.seed:
+            parser.error("{}: the baseline was made with other --frames or --seed, so its inputs differ.".format(args.baseline))
+
+    benchmarks: List[Benchmark] = []
+    if "schedulers" in args.suites:
+        benchmarks += scheduler_benchmarks(args.seed)
+    if "memories" in args.suites:
+        benchmarks += memory_benchmarks(args.seed, args.frames)
+    if "disks" in args.suites:
+        benchmarks += disk_benchmarks(args.seed)
+    if len(args.only) > 0:
+        benchmarks = [b for b in benchmarks if b[1] in args.only]
+
+    results = run_benchmarks(benchmarks, args.sizes, args.repeat, args.time_limit, not args.no_memory)
+    print_results(results)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({
+                "version": BENCHMARK_VERSION,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "frames": args.frames,
+                "seed": args.seed,
+                "results": results,
+            }, file, indent=2)
+
+    if baseline is not None:
+        comparisons = compare_to_baseline(results, baseline["results"], args.threshold)
+        print()
+        print("# COMPARED TO BASELINE")
+        print_comparisons(comparisons)
+
+        num_regressions = sum(c["is_regression"] for c in comparisons)
+        print("{} of {} benchmarks got slower by more than {:.0f}%.".format(num_regressions, len(comparisons), args.threshold * 100))
+        if num_regressions > 0:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,8 @@ import os
 from typing import List
 
 from modules.memories import Memory, FIFO, LRU, LFU, Optimal
-from modules import MemorySnapshot, MemoryMetrics
-from views import View, TableView
+from modules import MemorySnapshot, MemoryMetrics, PagingTimeline
+from views import View, TableView, TableWriter
 from utils.io import input_bounded_num, input_choice
 
 def main():
@@ -27,7 +27,7 @@ def main():
     print(View.numbered_list(m.name for m in memory_choices), end="\n\n")
     
     is_selecting = True
-    memories: List[tuple[Memory, List[MemorySnapshot]]] = [] 
+    memories: List[tuple[Memory, PagingTimeline]] = [] 
     while is_selecting:
         memory_choice = input_bounded_num("Selected Memory: ", max=len(memory_choices))
         frame_size = input_bounded_num("Frame Size: ")
@@ -35,7 +35,7 @@ def main():
         chosen_memory = memory_choices[memory_choice - 1]
         memory_instance = chosen_memory(frame_size) if chosen_memory != Optimal else chosen_memory(frame_size, pages)
         if all(m != memory_instance for m, _ in memories):
-            memories.append((memory_instance, []))
+            memories.append((memory_instance, PagingTimeline(memory_instance)))
         else:
             print("Chosen memory configuration is a duplicate, it won't be added further.\n")
 
@@ -47,11 +47,8 @@ def main():
 
     # Simulate a running paging process for all pagers
     for memory, paging_timeline in memories:
-        for time, page in enumerate(pages, start=1):
-            replaced_page, is_fault = memory.load(page)
-
-            snapshot = MemorySnapshot(time, memory, page, replaced_page, is_fault)
-            paging_timeline.append(snapshot)
+        for page in pages:
+            paging_timeline.load(page)
 
     # Print details of execution of memory algos
     os.system("cls")
@@ -67,17 +64,25 @@ def main():
         print("=====", memory.extended_name, "Simulation =====")
         page_ref_table = TableView()
         # This is to ensure that Pages header is aligned with the columns in Memory State Visualization
-        row_header_pad = len("Frame {}".format(memory.frame_label_of(memory[0])))
+        row_header_pad = len("Frame {}".format(memory.frame_label(0)))
         page_ref_table.add_item("{:>{}}".format("Pages", row_header_pad), *(page for page in pages))
         page_ref_table.render()
         print()
 
         print("## Memory State Visualization")
         print("Legend: F -> Page Fault | H -> Page Hit")
-        table = TableView(header=["Time"] + [str(s.snapped_on) for s in paging_timeline], footer=["Status"] + [s.status for s in paging_timeline])
-        for frame in range(memory.capacity):
-            row_header = "Frame {}".format(memory.frame_label_of(memory[frame]))
-            table.add_item(row_header, *(s.snapshot[frame] if s.snapshot[frame] is not None else "--" for s in paging_timeline))
+        header = ["Time"] + [str(s.snapped_on) for s in paging_timeline]
+        footer = ["Status"] + [s.status for s in paging_timeline]
+
+        def create_rows():
+            for frame in range(memory.capacity):
+                row_header = "Frame {}".format(memory.frame_label(frame))
+                yield [row_header, *(page if page is not None else "--" for page in paging_timeline.frame_history(frame))]
+
+        # The frames are gone over twice rather than held as rows, once to fit the columns and once to write them
+        table = TableWriter(header=header, footer=footer, cell_widths=TableWriter.fit_widths(create_rows(), header=header, footer=footer))
+        for row in create_rows():
+            table.add_item(*row)
         table.render()
         print()
         
@@ -92,8 +97,10 @@ def main():
         print("State Format: {}".format(memory.state_annotation))
         print("Legend: {}".format(MemorySnapshot.log_legend))
         time_pad = max(len(str(s.snapped_on)) for s in paging_timeline)
-        mem_state_pad = max(len(str(s.snapshot.state)) for s in paging_timeline)
-        logs = [s.log(state_log_pad=mem_state_pad, time_log_pad=time_pad) for s in paging_timeline]
+        # The states are rebuilt in one pass over the timeline, rather than from a checkpoint for each step
+        mem_states = [str(state) for state in paging_timeline.states()]
+        mem_state_pad = max(len(state) for state in mem_states)
+        logs = [s.log(state_log_pad=mem_state_pad, time_log_pad=time_pad, state=state) for s, state in zip(paging_timeline, mem_states)]
         logs.reverse()
         print(*logs, sep="\n")
 
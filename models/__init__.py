@@ -1,2 +1,4 @@
-from .process import Process
-from .process_log import ProcessLog
\ No newline at end of file
+from .process import Process, ProcessState
+from .process_table import ProcessTable, ProcessView
+from .process_log import ProcessLog
+from .process_timeline import ProcessTimeline, IDLE_PID
\ No newline at end of file
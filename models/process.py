@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 
 def num_sequence_generator(seed = 1):
@@ -8,9 +9,18 @@ def num_sequence_generator(seed = 1):
         yield value
         value += 1
 
+class ProcessState(Enum):
+    """ The stages in the lifecycle of a process. """
+    WAITING = "waiting"
+    READY = "ready"
+    RUNNING = "running"
+    DONE = "done"
+
 class Process:
     """ Models the form of a process in an operating system. """
 
+    __slots__ = ("__pid", "__arrival", "__burst", "__burst_remaining", "__priority", "__queue_level", "__first_dispatch", "__completion", "__turnaround", "__waiting", "__state")
+
     id_sequence = num_sequence_generator()
 
     def __init__(self, pid: int, arrival_time: int, burst_time: int, priority: int = 1, queue_level: int = 1):
@@ -23,9 +33,12 @@ class Process:
         self.__priority: int = priority
         self.__queue_level: int = queue_level
 
+        self.__first_dispatch: Optional[int] = None
         self.__completion: Optional[int] = None
         self.__turnaround: Optional[int] = None
         self.__waiting: Optional[int] = None
+
+        self.__state: ProcessState = ProcessState.WAITING
     
     @property 
     def pid(self):
@@ -55,6 +68,15 @@ class Process:
     def burst_remaining(self):
         return self.__burst_remaining
     
+    @property
+    def first_dispatch(self):
+        return self.__first_dispatch
+
+    @property
+    def response(self):
+        """ The time the process waited before it was first dispatched onto the processor. """
+        return self.__first_dispatch - self.__arrival if self.__first_dispatch is not None else None
+
     @property 
     def completion(self):
         return self.__completion
@@ -67,6 +89,14 @@ class Process:
     def waiting(self):
         return self.__waiting
     
+    @property
+    def state(self):
+        return self.__state
+
+    @state.setter
+    def state(self, state: ProcessState):
+        self.__state = state
+    
     @property
     def is_marked_completed(self):
         return self.__completion is not None
@@ -79,8 +109,14 @@ class Process:
         """ Runs the process based on a given time quantum. """
         self.__burst_remaining -= time_quantum
 
+    def mark_dispatched_on(self, timestamp: int):
+        """ Records the time that the process was first dispatched, which is kept when it is dispatched again. """
+        if self.__first_dispatch is None:
+            self.__first_dispatch = timestamp
+
     def mark_completed_on(self, timestamp: int):
         """ Marks the process as ended and records its time of completion based on a timestamp. """
         self.__completion = timestamp
         self.__turnaround = self.__completion - self.__arrival
-        self.__waiting = self.__turnaround - self.__burst
\ No newline at end of file
+        self.__waiting = self.__turnaround - self.__burst
+        self.__state = ProcessState.DONE
\ No newline at end of file
@@ -0,0 +1,230 @@
+from array import array
+from typing import Any, Iterable, Iterator, Optional
+
+from .process import ProcessState
+
+# Completion time of a process that has yet to be completed
+NOT_COMPLETED = -1
+# First dispatch time of a process that has yet to be dispatched
+NOT_DISPATCHED = -1
+
+STATES = list(ProcessState)
+STATE_CODES = { state: code for code, state in enumerate(STATES) }
+
+# The process fields that can be used to select or fill rows, and the columns that store them
+COLUMNS = {
+    "pid": "_pids",
+    "arrival": "_arrivals",
+    "burst": "_bursts",
+    "burst_remaining": "_bursts_remaining",
+    "priority": "_priorities",
+    "queue_level": "_queue_levels",
+}
+
+class ProcessTable:
+    """
+        Stores the fields of many processes in typed columns rather than as separate objects,
+        so that large workloads fit in memory. The rows are accessed as ProcessView instances,
+        which can be used anywhere a Process can.
+    """
+
+    def __init__(self):
+        self._pids = array("q")
+        self._arrivals = array("q")
+        self._bursts = array("q")
+        self._bursts_remaining = array("q")
+        self._priorities = array("l")
+        self._queue_levels = array("l")
+        self._first_dispatches = array("q")
+        self._completions = array("q")
+        self._states = array("b")
+
+        # Maps a position in the table to a row in the columns, which allows
+        # selections of a table to share the same columns as the table.
+        self._rows: Optional[array] = None
+
+    @classmethod
+    def from_processes(cls, processes: Iterable[Any]):
+        """ Creates a table from an iterable of processes, without keeping the processes themselves around. """
+        table = cls()
+        for p in processes:
+            table.append(p.pid, p.arrival, p.burst, p.priority, p.queue_level)
+
+        return table
+
+    def __len__(self):
+        return len(self._rows) if self._rows is not None else len(self._pids)
+
+    def __getitem__(self, idx: int):
+        if idx < 0:
+            idx += len(self)
+        return ProcessView(self, self._rows[idx] if self._rows is not None else idx)
+
+    def __iter__(self) -> Iterator['ProcessView']:
+        rows = self._rows if self._rows is not None else range(len(self._pids))
+        return (ProcessView(self, row) for row in rows)
+
+    def append(self, pid: int, arrival_time: int, burst_time: int, priority: int = 1, queue_level: int = 1):
+        """ Adds a process to the table, and returns its view. """
+        if self._rows is not None:
+            raise ValueError("Processes can not be appended to a selection of a table.")
+
+        self._pids.append(pid)
+        self._arrivals.append(arrival_time)
+        self._bursts.append(burst_time)
+        self._bursts_remaining.append(burst_time)
+        self._priorities.append(priority)
+        self._queue_levels.append(queue_level)
+        self._first_dispatches.append(NOT_DISPATCHED)
+        self._completions.append(NOT_COMPLETED)
+        self._states.append(STATE_CODES[ProcessState.WAITING])
+
+        return ProcessView(self, len(self._pids) - 1)
+
+    def __select(self, rows: Iterable[int]):
+        """ Creates a table that shares the columns of this table, but only contains the given rows. """
+        selection = ProcessTable.__new__(ProcessTable)
+        selection.__dict__.update(self.__dict__)
+        selection._rows = array("q", rows)
+        return selection
+
+    def where(self, **column_values: int):
+        """ Selects the processes whose fields match the given values (e.g. where(queue_level=0)). """
+        columns = [(getattr(self, COLUMNS[name]), value) for name, value in column_values.items()]
+        rows = self._rows if self._rows is not None else range(len(self._pids))
+        return self.__select(row for row in rows if all(column[row] == value for column, value in columns))
+
+    def sorted_by_arrival(self):
+        """ Selects all the processes, ordered by their arrival time then their pid. """
+        rows = self._rows if self._rows is not None else range(len(self._pids))
+        # Sorting is stable, so sorting by pid first breaks the ties between arrival times
+        rows = sorted(rows, key=self._pids.__getitem__)
+        rows.sort(key=self._arrivals.__getitem__)
+        return self.__select(rows)
+
+    def column(self, name: str):
+        """ Retrieves a field of all the processes in the table as an array, in the order of the table (e.g. column("arrival")). """
+        column = getattr(self, COLUMNS[name])
+        return column if self._rows is None else array(column.typecode, (column[row] for row in self._rows))
+
+    def mark_all_completed(self, first_dispatches: Iterable[int], completions: Iterable[int]):
+        """ Marks all the processes in the table as run to completion at once, given their times in the order of the table. """
+        if self._rows is None:
+            # Replaces the columns in place, so that selections sharing them also see the changes
+            self._first_dispatches[:] = array("q", first_dispatches)
+            self._completions[:] = array("q", completions)
+            self._bursts_remaining[:] = array("q", bytes(8 * len(self._pids)))
+            self._states[:] = array("b", [STATE_CODES[ProcessState.DONE]]) * len(self._pids)
+            return
+
+        for row, first_dispatch, completion in zip(self._rows, first_dispatches, completions):
+            self._bursts_remaining[row] = 0
+            self._first_dispatches[row] = first_dispatch
+            self._completions[row] = completion
+            self._states[row] = STATE_CODES[ProcessState.DONE]
+
+    def fill(self, **column_values: int):
+        """ Sets a field of all the processes in the table to a given value (e.g. fill(queue_level=-1)). """
+        rows = self._rows if self._rows is not None else range(len(self._pids))
+        for name, value in column_values.items():
+            column = getattr(self, COLUMNS[name])
+            for row in rows:
+                column[row] = value
+
+class ProcessView:
+    """ A lightweight view over a row of a process table, that behaves like a Process. """
+
+    __slots__ = ("__table", "__row")
+
+    def __init__(self, table: ProcessTable, row: int):
+        self.__table: ProcessTable = table
+        self.__row: int = row
+
+    def __eq__(self, other: object):
+        return isinstance(other, ProcessView) and self.__row == other.__row and self.__table._pids is other.__table._pids
+
+    def __hash__(self):
+        return hash((id(self.__table._pids), self.__row))
+
+    @property
+    def pid(self):
+        return self.__table._pids[self.__row]
+
+    @property
+    def priority(self):
+        return self.__table._priorities[self.__row]
+
+    @property
+    def queue_level(self):
+        return self.__table._queue_levels[self.__row]
+
+    @queue_level.setter
+    def queue_level(self, queue_level: int):
+        self.__table._queue_levels[self.__row] = queue_level
+
+    @property
+    def arrival(self):
+        return self.__table._arrivals[self.__row]
+
+    @property
+    def burst(self):
+        return self.__table._bursts[self.__row]
+
+    @property
+    def burst_remaining(self):
+        return self.__table._bursts_remaining[self.__row]
+
+    @property
+    def first_dispatch(self):
+        first_dispatch = self.__table._first_dispatches[self.__row]
+        return first_dispatch if first_dispatch != NOT_DISPATCHED else None
+
+    @property
+    def response(self):
+        first_dispatch = self.first_dispatch
+        return first_dispatch - self.arrival if first_dispatch is not None else None
+
+    @property
+    def completion(self):
+        completion = self.__table._completions[self.__row]
+        return completion if completion != NOT_COMPLETED else None
+
+    @property
+    def turnaround(self):
+        completion = self.completion
+        return completion - self.arrival if completion is not None else None
+
+    @property
+    def waiting(self):
+        turnaround = self.turnaround
+        return turnaround - self.burst if turnaround is not None else None
+
+    @property
+    def state(self):
+        return STATES[self.__table._states[self.__row]]
+
+    @state.setter
+    def state(self, state: ProcessState):
+        self.__table._states[self.__row] = STATE_CODES[state]
+
+    @property
+    def is_marked_completed(self):
+        return self.__table._completions[self.__row] != NOT_COMPLETED
+
+    @property
+    def is_depleted(self):
+        return self.__table._bursts_remaining[self.__row] <= 0
+
+    def tick(self, time_quantum: int = 1):
+        """ Runs the process based on a given time quantum. """
+        self.__table._bursts_remaining[self.__row] -= time_quantum
+
+    def mark_dispatched_on(self, timestamp: int):
+        """ Records the time that the process was first dispatched, which is kept when it is dispatched again. """
+        if self.__table._first_dispatches[self.__row] == NOT_DISPATCHED:
+            self.__table._first_dispatches[self.__row] = timestamp
+
+    def mark_completed_on(self, timestamp: int):
+        """ Marks the process as ended and records its time of completion based on a timestamp. """
+        self.__table._completions[self.__row] = timestamp
+        self.state = ProcessState.DONE
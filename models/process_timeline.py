@@ -0,0 +1,68 @@
+from array import array
+from typing import Iterable, Iterator
+
+from .process_log import ProcessLog
+
+# The pid recorded for the time that the processor is idle
+IDLE_PID = -1
+
+class ProcessTimeline:
+    """
+        Records the execution timeline of a processor in parallel columns of pids, start times,
+        end times, and tags. Slices of the same process with the same tag that directly follow
+        each other are merged into one, and the slices are read back as ProcessLog records.
+    """
+
+    def __init__(self):
+        self._pids = array("q")
+        self._starts = array("q")
+        self._ends = array("q")
+        self._tags = array("l")
+
+    @classmethod
+    def from_columns(cls, pids: Iterable[int], starts: Iterable[int], ends: Iterable[int], tags: Iterable[int]):
+        """ Creates a timeline from columns of slices that were computed elsewhere, which are expected to be merged already. """
+        timeline = cls()
+        timeline._pids = array("q", pids)
+        timeline._starts = array("q", starts)
+        timeline._ends = array("q", ends)
+        timeline._tags = array("l", tags)
+
+        return timeline
+
+    def __len__(self):
+        return len(self._pids)
+
+    def __getitem__(self, idx: int):
+        if idx < 0:
+            idx += len(self._pids)
+        return self.__log_at(idx)
+
+    def __iter__(self) -> Iterator[ProcessLog]:
+        return (self.__log_at(idx) for idx in range(len(self._pids)))
+
+    def __log_at(self, idx: int):
+        pid = self._pids[idx]
+        name = "idle" if pid == IDLE_PID else str(pid)
+        return ProcessLog(name, self._starts[idx], self._ends[idx], tag=self._tags[idx])
+
+    def columns(self):
+        """ Retrieves the pid, start, end, and tag columns of the timeline as arrays, which are shared and should not be modified. """
+        return self._pids, self._starts, self._ends, self._tags
+
+    @property
+    def last_end(self):
+        """ The end time of the last slice in the timeline. It is None if the timeline is empty. """
+        return self._ends[-1] if len(self._ends) > 0 else None
+
+    def append(self, pid: int, start_time: int, end_time: int, tag: int):
+        """ Records a slice of execution, merging it with the last slice if it continues it. """
+        last = len(self._pids) - 1
+
+        if last >= 0 and self._pids[last] == pid and self._tags[last] == tag and self._ends[last] == start_time:
+            self._ends[last] = end_time
+        else:
+            self._pids.append(pid)
+            self._starts.append(start_time)
+            self._ends.append(end_time)
+            self._tags.append(tag)
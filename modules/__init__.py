@@ -1,5 +1,13 @@
 from .clock import Clock
 from .processor import Processor
+from .scheduling_metrics import SchedulingMetrics
+from .simulator import Simulator, SimulationResult, simulate
+from .smp import SMPSimulator, SMPSimulationResult, simulate_smp
+from .comparison import compare
+from .sweep import SweepCache, sweep
+from .checkpoint import save_checkpoint, load_checkpoint, run_with_checkpoints
+from .instrumentation import Profiler
 
 from .memory_snapshot import MemorySnapshot
+from .paging_timeline import PagingTimeline
 from .memory_metrics import MemoryMetrics
\ No newline at end of file
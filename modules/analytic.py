@@ -0,0 +1,169 @@
+from functools import partial
+from heapq import heappush, heappop
+from typing import Any, Callable, List, Tuple, Union
+
+from models import Process, ProcessTable, ProcessTimeline, IDLE_PID
+from .processor import Processor
+from .schedulers import Scheduler, FCFS, SJF, PriorityNP
+from .scheduling_metrics import SchedulingMetrics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The schedulers whose runs can be computed without simulating them. Each of them dispatches processes one after
+# another without preemption, so a run only depends on the order that the processes are dispatched in.
+ANALYTIC_SCHEDULERS = (FCFS, SJF, PriorityNP)
+
+def is_supported(processes: Union[List[Process], ProcessTable], scheduler_factory: Callable[[List[Process], Processor], Scheduler]):
+    """ Checks whether the run of the processes on the scheduler made by the factory can be computed with NumPy, rather than simulated. """
+    return (
+        np is not None
+        and isinstance(processes, (list, ProcessTable))
+        and isinstance(scheduler_factory, partial)
+        and scheduler_factory.func in ANALYTIC_SCHEDULERS
+        and len(scheduler_factory.args) == 0
+        and len(scheduler_factory.keywords) == 0
+        and len(processes) > 0
+        and _is_unrun(processes)
+    )
+
+def _is_unrun(processes: Union[List[Process], ProcessTable]):
+    """ Checks that none of the processes were run yet, since those should go through the simulator, which picks up where they left off. """
+    if isinstance(processes, ProcessTable):
+        # Bursts are at least 1, so a process that was run has less of its burst remaining
+        return bool(np.array_equal(np.array(processes.column("burst_remaining")), np.array(processes.column("burst"))))
+
+    return all(not p.is_marked_completed and p.burst_remaining == p.burst for p in processes)
+
+def _read_columns(processes: Union[List[Process], ProcessTable]):
+    """ Reads the fields that affect the run into NumPy arrays, in the order of the processes. """
+    if isinstance(processes, ProcessTable):
+        return tuple(np.array(processes.column(name), dtype=np.int64) for name in ("pid", "arrival", "burst", "priority", "queue_level"))
+
+    num_processes = len(processes)
+    return (
+        np.fromiter((p.pid for p in processes), dtype=np.int64, count=num_processes),
+        np.fromiter((p.arrival for p in processes), dtype=np.int64, count=num_processes),
+        np.fromiter((p.burst for p in processes), dtype=np.int64, count=num_processes),
+        np.fromiter((p.priority for p in processes), dtype=np.int64, count=num_processes),
+        np.fromiter((p.queue_level for p in processes), dtype=np.int64, count=num_processes),
+    )
+
+def _dispatch_order(scheduler: Any, arrival_order: Any, arrivals: Any, bursts: Any, priorities: Any):
+    """
+        Finds the order that the scheduler dispatches the processes in, as indices into the processes. FCFS dispatches
+        them by arrival, while SJF and PriorityNP pick from the processes that arrived by the time the processor frees up.
+    """
+    if scheduler == FCFS:
+        return arrival_order
+
+    # The rank of a process by its dispatch key, where ties are broken by the order of arrival just like the ready queue.
+    # Ranks are plain integers, so that the heap below never compares tuples.
+    num_processes = len(arrival_order)
+    arrival_ranks = np.empty(num_processes, dtype=np.int64)
+    arrival_ranks[arrival_order] = np.arange(num_processes)
+    keys = (arrival_ranks, bursts) if scheduler == SJF else (arrival_ranks, bursts, priorities)
+    key_order = np.lexsort(keys)
+    key_ranks = np.empty(num_processes, dtype=np.int64)
+    key_ranks[key_order] = np.arange(num_processes)
+
+    sorted_arrivals = arrivals[arrival_order].tolist()
+    sorted_key_ranks = key_ranks[arrival_order].tolist()
+    burst_by_rank = bursts[key_order].tolist()
+
+    dispatched_ranks: List[int] = []
+    ready: List[int] = []
+    cursor, time = 0, 0
+    while cursor < num_processes or len(ready) > 0:
+        if len(ready) == 0 and sorted_arrivals[cursor] > time:
+            time = sorted_arrivals[cursor]
+
+        while cursor < num_processes and sorted_arrivals[cursor] <= time:
+            heappush(ready, sorted_key_ranks[cursor])
+            cursor += 1
+
+        rank = heappop(ready)
+        dispatched_ranks.append(rank)
+        time += burst_by_rank[rank]
+
+    return key_order[np.array(dispatched_ranks, dtype=np.int64)]
+
+def _build_timeline(pids: Any, starts: Any, completions: Any, tags: Any):
+    """ Interleaves the slices of the dispatched processes with the idle gaps before them, and merges slices that continue each other. """
+    previous_ends = np.concatenate(([0], completions[:-1]))
+    has_gap = starts > previous_ends
+    num_slices = len(pids) + int(has_gap.sum())
+
+    # Each process takes up one row, after the row of the idle gap before it if there is one
+    process_rows = np.arange(len(pids)) + np.cumsum(has_gap)
+    gap_rows = process_rows[has_gap] - 1
+
+    timeline_pids = np.empty(num_slices, dtype=np.int64)
+    timeline_starts = np.empty(num_slices, dtype=np.int64)
+    timeline_ends = np.empty(num_slices, dtype=np.int64)
+    timeline_tags = np.empty(num_slices, dtype=np.int64)
+
+    timeline_pids[process_rows], timeline_starts[process_rows], timeline_ends[process_rows], timeline_tags[process_rows] = pids, starts, completions, tags
+    # Idle gaps are tagged with the process that ended them, just like in the processor
+    timeline_pids[gap_rows], timeline_starts[gap_rows], timeline_ends[gap_rows], timeline_tags[gap_rows] = IDLE_PID, previous_ends[has_gap], starts[has_gap], tags[has_gap]
+
+    continues = np.concatenate(([False], (timeline_pids[1:] == timeline_pids[:-1]) & (timeline_tags[1:] == timeline_tags[:-1]) & (timeline_starts[1:] == timeline_ends[:-1])))
+    if continues.any():
+        first_rows = np.flatnonzero(~continues)
+        last_rows = np.concatenate((first_rows[1:] - 1, [num_slices - 1]))
+        timeline_pids, timeline_starts, timeline_tags = timeline_pids[first_rows], timeline_starts[first_rows], timeline_tags[first_rows]
+        timeline_ends = timeline_ends[last_rows]
+
+    return ProcessTimeline.from_columns(timeline_pids.tolist(), timeline_starts.tolist(), timeline_ends.tolist(), timeline_tags.tolist())
+
+def run_analytically(processes: Union[List[Process], ProcessTable], scheduler_factory: Callable[[List[Process], Processor], Scheduler]) -> Tuple[ProcessTimeline, int, int, SchedulingMetrics]:
+    """
+        Computes the run of processes on a non-preemptive scheduler with NumPy, and marks the processes as completed.
+        The timeline, total run time, idle time, and metrics that are returned match those of a simulation. Since no
+        process is ever preempted, a process starts either once the one before it completes or once it arrives,
+        whichever is later, so the completion times follow from a running maximum over the cumulative bursts.
+    """
+    pids, arrivals, bursts, priorities, queue_levels = _read_columns(processes)
+
+    # Sorting is stable, so sorting by pid first breaks the ties between arrival times
+    arrival_order = np.argsort(pids, kind="stable")
+    arrival_order = arrival_order[np.argsort(arrivals[arrival_order], kind="stable")]
+    order = _dispatch_order(scheduler_factory.func, arrival_order, arrivals, bursts, priorities)
+
+    ordered_arrivals, ordered_bursts = arrivals[order], bursts[order]
+    cumulative_bursts = np.cumsum(ordered_bursts)
+    completions = cumulative_bursts + np.maximum.accumulate(ordered_arrivals - (cumulative_bursts - ordered_bursts))
+    starts = completions - ordered_bursts
+
+    timeline = _build_timeline(pids[order], starts, completions, queue_levels[order])
+    total_run_time = int(completions[-1])
+    idle_time = total_run_time - int(cumulative_bursts[-1])
+
+    # Write the times back in the order of the processes
+    process_starts = np.empty_like(starts)
+    process_completions = np.empty_like(completions)
+    process_starts[order] = starts
+    process_completions[order] = completions
+
+    if isinstance(processes, ProcessTable):
+        processes.mark_all_completed(process_starts.tolist(), process_completions.tolist())
+    else:
+        for p, first_dispatch, completion in zip(processes, process_starts.tolist(), process_completions.tolist()):
+            p.tick(p.burst_remaining)
+            p.mark_dispatched_on(first_dispatch)
+            p.mark_completed_on(completion)
+
+    turnarounds = completions - ordered_arrivals
+    waitings = turnarounds - ordered_bursts
+    ordered_pids = pids[order]
+
+    metrics = SchedulingMetrics()
+    metrics.record_completions(
+        turnarounds.tolist(), waitings.tolist(), (starts - ordered_arrivals).tolist(),
+        first_arrival=int(arrivals.min()), last_completion=total_run_time,
+        context_switches=int((ordered_pids[1:] != ordered_pids[:-1]).sum()),
+    )
+
+    return timeline, total_run_time, idle_time, metrics
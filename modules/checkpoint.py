@@ -0,0 +1,59 @@
+import os
+import gzip
+import pickle
+from typing import Optional, Union
+
+from .simulator import Simulator
+from .smp import SMPSimulator
+
+# Changing what a simulator holds should bump this, so that checkpoints of older simulators are not resumed
+CHECKPOINT_VERSION = 1
+
+def save_checkpoint(simulator: Union[Simulator, SMPSimulator], path: str):
+    """
+        Saves the complete state of an in-flight simulation to a compressed file, including its processes, scheduler,
+        clock, and the signal subscriptions between them, replacing the file at once so that a crash mid-write never
+        leaves a broken checkpoint behind.
+    """
+    directory = os.path.dirname(path)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = path + ".{}.tmp".format(os.getpid())
+    with gzip.open(temp_path, "wb", compresslevel=6) as file:
+        pickle.dump({ "version": CHECKPOINT_VERSION, "simulator": simulator }, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+def load_checkpoint(path: str) -> Union[Simulator, SMPSimulator]:
+    """
+        Loads a simulation saved with save_checkpoint, which picks up from where it was saved once it is run. Loading
+        the same checkpoint again yields an independent copy, so what-if runs can branch off from it. Checkpoints are
+        pickles, so only load those from trusted sources.
+    """
+    with gzip.open(path, "rb") as file:
+        checkpoint = pickle.load(file)
+
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError("The checkpoint at {} was saved by another version of the simulator.".format(path))
+    return checkpoint["simulator"]
+
+def run_with_checkpoints(simulator: Union[Simulator, SMPSimulator], path: str, every_events: int, until: Optional[int] = None):
+    """
+        Runs a simulation like its run method, saving a checkpoint every given number of events, and once more where
+        it stops. A long run that is cut short can then be resumed from its last checkpoint.
+    """
+    if every_events < 1:
+        raise ValueError("Checkpoints should be saved at least every 1 event.")
+
+    last_saved = simulator.num_events
+    while not simulator.is_finished:
+        if until is not None and simulator.next_event_time > until:
+            break
+        simulator.step()
+
+        if simulator.num_events - last_saved >= every_events:
+            save_checkpoint(simulator, path)
+            last_saved = simulator.num_events
+
+    save_checkpoint(simulator, path)
+    return simulator
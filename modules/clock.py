@@ -11,5 +11,6 @@ class Clock:
     def time(self):
         return self.__time
     
-    def tick(self):
-        self.__time += 1
+    def tick(self, amount: int = 1):
+        """ Moves the clock forward by a given amount of time units. """
+        self.__time += amount
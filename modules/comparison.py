@@ -0,0 +1,41 @@
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from models import Process, ProcessTable
+from .processor import Processor
+from .schedulers import Scheduler
+from .simulator import simulate
+
+# The workload that each worker process receives once, when it starts
+_worker_processes: Union[List[Process], ProcessTable] = []
+
+def _receive_workload(processes: Union[List[Process], ProcessTable]):
+    global _worker_processes
+    _worker_processes = processes
+
+def _simulate_copy(processes: Union[List[Process], ProcessTable], name: str, scheduler_factory: Callable[[List[Process], Processor], Scheduler]):
+    """ Simulates a copy of the workload, since processes are changed during a run. """
+    result = simulate(deepcopy(processes), scheduler_factory)
+    return name, result.metrics()
+
+def _simulate_received_workload(name: str, scheduler_factory: Callable[[List[Process], Processor], Scheduler]):
+    return _simulate_copy(_worker_processes, name, scheduler_factory)
+
+def compare(processes: Union[List[Process], ProcessTable], scheduler_factories: Dict[str, Callable[[List[Process], Processor], Scheduler]], max_workers: Optional[int] = None):
+    """
+        Simulates the same workload on each of the named scheduler factories in parallel worker processes,
+        and returns the name and metrics of each run, ranked by average turnaround time then average waiting time.
+        Setting max_workers to 1 runs every simulation in the current process instead.
+    """
+    results: List[Tuple[str, Dict[str, Any]]] = []
+
+    if max_workers == 1:
+        results = [_simulate_copy(processes, name, factory) for name, factory in scheduler_factories.items()]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_receive_workload, initargs=(processes,)) as executor:
+            futures = [executor.submit(_simulate_received_workload, name, factory) for name, factory in scheduler_factories.items()]
+            results = [future.result() for future in futures]
+
+    results.sort(key=lambda result : (result[1]["average_turnaround"], result[1]["average_waiting"]))
+    return results
@@ -0,0 +1,142 @@
+import json
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from utils.signal import Signal
+from utils.histogram import LogHistogram
+from .processor import Processor
+from .schedulers import Scheduler, RoundRobin
+from .simulator import Simulator
+from .smp import SMPSimulator
+from .scheduling_metrics import PERCENTILES
+
+class Profiler:
+    """
+        Opt-in instrumentation of the hot paths of a simulation. Attaching a profiler to a simulator wraps the methods of
+        its scheduler, the layers of a multilevel scheduler, their ready queues, the processor, and the signals between
+        them, counting calls and adding up the wall time of each. After every step, the lengths of the ready queues and
+        the number of subscribers of each signal are sampled. Nothing is wrapped until a profiler is attached, so
+        simulations that are not profiled run the same code as before. Times are inclusive, so the time of a scheduler
+        includes the time of its layers. A simulator can not be checkpointed while a profiler is attached.
+    """
+
+    def __init__(self):
+        # The number of calls and the total seconds of each phase
+        self.__phases: Dict[str, List[Union[int, float]]] = {}
+        self.__queue_lengths: Dict[str, LogHistogram] = {}
+        self.__subscriber_counts: Dict[str, LogHistogram] = {}
+        self.__samplers: List[Tuple[str, Dict[str, LogHistogram], Callable[[], int]]] = []
+        self.__wrapped: List[Tuple[Any, str]] = []
+        self.__num_steps: int = 0
+
+    def __wrap(self, obj: Any, attr: str, phase: str):
+        """ Replaces a method of an object with one that times it, unless it was already replaced (e.g. a ready queue shared by many cores). """
+        if attr in vars(obj):
+            return
+
+        method = getattr(obj, attr)
+        stats = self.__phases.setdefault(phase, [0, 0.0])
+
+        def timed(*args: Any, **kwargs: Any):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats[0] += 1
+                stats[1] += perf_counter() - start
+
+        setattr(obj, attr, timed)
+        self.__wrapped.append((obj, attr))
+
+    def __sample(self, label: str, histograms: Dict[str, LogHistogram], fn: Callable[[], int]):
+        """ Samples a count with a function after every step, into a histogram shared by every sample with the same label. """
+        histograms.setdefault(label, LogHistogram())
+        self.__samplers.append((label, histograms, fn))
+
+    def __attach_signals(self, obj: Any, prefix: str):
+        """ Times the emits of the signals that an object holds, which fan out to their subscribers. """
+        for attr, value in vars(obj).items():
+            if isinstance(value, Signal):
+                # Private attributes are mangled with the name of their class, which is left out of the label
+                label = "{}.{}".format(prefix, attr.rsplit("__", 1)[-1])
+                self.__wrap(value, "emit", label + ".emit")
+                self.__sample(label, self.__subscriber_counts, value.__len__)
+
+    def __attach_scheduler(self, scheduler: Scheduler, prefix: str):
+        """ Times the scheduler and its ready queue, and then each of its layers by their queue level. """
+        self.__wrap(scheduler, "run", prefix + ".run")
+        self.__wrap(scheduler, "get_arrived_processes", prefix + ".get_arrived_processes")
+        # MLFQ never runs its layers, but queues and demotes processes into them, so the queueing is timed on its own
+        self.__wrap(scheduler, "enqueue", prefix + ".enqueue")
+        if isinstance(scheduler, RoundRobin):
+            self.__wrap(scheduler, "requeue", prefix + ".requeue")
+        for attr in ("push", "extend", "pop"):
+            self.__wrap(scheduler.ready_queue, attr, prefix + ".ready_queue." + attr)
+        # The ready queue of a multilevel scheduler is only ever the one of its layers
+        if len(scheduler.layers) == 0:
+            self.__sample(prefix, self.__queue_lengths, scheduler.ready_queue.__len__)
+
+        for level, layer in enumerate(scheduler.layers, start=1):
+            self.__attach_scheduler(layer, "{}.layer {}".format(prefix, level))
+
+    def __attach_processor(self, processor: Processor):
+        for attr in ("run", "load", "clear"):
+            self.__wrap(processor, attr, "processor." + attr)
+        self.__attach_signals(processor, "processor")
+
+    def __sample_all(self):
+        self.__num_steps += 1
+        for label, histograms, fn in self.__samplers:
+            histograms[label].add(fn())
+
+    def attach(self, simulator: Union[Simulator, SMPSimulator]):
+        """ Instruments a simulator before it is run. The phases of every core of many cores are added together. """
+        self.__wrap(simulator, "step", "simulator.step")
+        self.__attach_signals(simulator, "simulator")
+
+        if isinstance(simulator, SMPSimulator):
+            for core in simulator.cores:
+                self.__attach_scheduler(core.scheduler, "scheduler")
+                self.__attach_processor(core.processor)
+        else:
+            self.__attach_scheduler(simulator.scheduler, "scheduler")
+            self.__attach_processor(simulator.processor)
+
+        # Sample after the step that was just wrapped, by wrapping it once more
+        step = simulator.step
+        def sampled_step():
+            step()
+            self.__sample_all()
+        simulator.step = sampled_step
+
+        return simulator
+
+    def detach(self):
+        """ Restores every method that was wrapped, so that the simulator runs without the profiler again. """
+        for obj, attr in reversed(self.__wrapped):
+            delattr(obj, attr)
+        self.__wrapped = []
+        self.__samplers = []
+
+    def summary(self) -> Dict[str, Any]:
+        """ Retrieves the calls and time of each phase, and the distributions of the sampled ready queue lengths and signal subscribers. """
+        phases = {
+            phase: { "calls": calls, "seconds": seconds, "mean_microseconds": seconds / calls * 1e6 if calls > 0 else 0.0 }
+            for phase, (calls, seconds) in sorted(self.__phases.items(), key=lambda item: -item[1][1])
+            if calls > 0
+        }
+
+        def describe(histograms: Dict[str, LogHistogram]):
+            return { label: { "mean": h.mean, **{ "p" + str(p): h.percentile(p) for p in PERCENTILES }, "max": h.max } for label, h in histograms.items() }
+
+        return {
+            "steps": self.__num_steps,
+            "phases": phases,
+            "ready_queue_lengths": describe(self.__queue_lengths),
+            "signal_subscribers": describe(self.__subscriber_counts),
+        }
+
+    def write_json(self, path: str):
+        """ Writes the summary to a JSON file. """
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=2)
@@ -1,4 +1,5 @@
-from typing import List, TypeVar
+from collections import deque
+from typing import Deque, TypeVar
 from .memory import Memory
 
 T = TypeVar("T")
@@ -10,25 +11,22 @@ class FIFO(Memory[T]):
     
     def __init__(self, frame_size: int):
         super().__init__(frame_size)
-        self.__arrival_queue: List[T] = []
+        self.__arrival_queue: Deque[T] = deque()
 
     @property
     def state(self):
-        return self.__arrival_queue
+        return list(self.__arrival_queue)
 
     def load(self, page: T):
         replaced_page, is_fault = None, False
         
-        if page not in self._memory:
-            # frame is defaulted to size, since we want to insert sequentially 
-            # into None filled spaces in memory until it is full
-            frame, is_fault = self.size, True
+        if page not in self._frames:
+            is_fault = True
 
             if self.is_full:
-                replaced_page = self.state.pop(0)
-                frame = self._memory.index(replaced_page)
+                replaced_page = self.__arrival_queue.popleft()
 
-            self._memory[frame] = page
+            self._place(page, replaced_page)
             self.__arrival_queue.append(page)
         
         return replaced_page, is_fault
@@ -1,4 +1,5 @@
-from typing import List, TypeVar
+from heapq import heapify, heappop, heappush
+from typing import Dict, List, Tuple, TypeVar
 from .memory import Memory
 
 T = TypeVar("T")
@@ -10,34 +11,78 @@ class LFU(Memory[T]):
 
     def __init__(self, frame_size: int):
         super().__init__(frame_size)
-        self.__frequencies: List[int] = [0] * self._capacity
-        self.__arrival_queue: List[T] = []
+        self.__frequencies: Dict[T, int] = {}
+        # The order in which the pages in memory were loaded, which breaks ties between pages of the same frequency
+        self.__arrivals: Dict[T, int] = {}
+        self.__num_arrivals: int = 0
+
+        # The pages of each frequency, as a heap of (arrival, page) from oldest to newest. A page that is used again
+        # is pushed into the next bucket, and its entry in the old one is only dropped once it reaches the top.
+        self.__buckets: Dict[int, List[Tuple[int, T]]] = {}
+        self.__bucket_sizes: Dict[int, int] = {}
+        self.__min_frequency: int = 0
 
     @property
     def state(self):
-        page_freqs = zip((page for page in self._memory if page is not None), self.__frequencies)
-        
-        # Sort by count, then time in memory
-        sorted_page_freqs = sorted(page_freqs, key=lambda pf : (pf[1], self.__arrival_queue.index(pf[0])))
-        return list(sorted_page_freqs)
-    
+        """ The pages and their frequencies in the order that they would be replaced, which is only sorted when it is looked at. """
+        return sorted(self.__frequencies.items(), key=lambda pf : (pf[1], self.__arrivals[pf[0]]))
+
+    def __is_current(self, frequency: int, entry: Tuple[int, T]):
+        """ Checks whether an entry of a bucket still stands for its page, rather than for one that was used again or replaced. """
+        arrival, page = entry
+        return self.__arrivals.get(page) == arrival and self.__frequencies[page] == frequency
+
+    def __push(self, frequency: int, page: T):
+        bucket = self.__buckets.setdefault(frequency, [])
+        self.__bucket_sizes[frequency] = self.__bucket_sizes.get(frequency, 0) + 1
+        heappush(bucket, (self.__arrivals[page], page))
+
+        # Keep buckets that hold on to pages for long from filling up with stale entries
+        if len(bucket) > 2 * self.__bucket_sizes[frequency] + 8:
+            bucket[:] = [entry for entry in bucket if self.__is_current(frequency, entry)]
+            heapify(bucket)
+
+    def __leave(self, frequency: int):
+        """ Counts a page out of the bucket of a frequency, and drops the bucket once it has no pages left. """
+        self.__bucket_sizes[frequency] -= 1
+        if self.__bucket_sizes[frequency] == 0:
+            del self.__buckets[frequency]
+            del self.__bucket_sizes[frequency]
+            if self.__min_frequency == frequency:
+                self.__min_frequency += 1
+
+    def __evict(self) -> T:
+        """ Removes the oldest page of the lowest frequency. """
+        bucket = self.__buckets[self.__min_frequency]
+        while not self.__is_current(self.__min_frequency, bucket[0]):
+            heappop(bucket)
+
+        _, page = heappop(bucket)
+        self.__leave(self.__min_frequency)
+        del self.__frequencies[page]
+        del self.__arrivals[page]
+        return page
+
     def load(self, page: T):
         replaced_page, is_fault = None, False
         
-        if page not in self._memory:
-            # frame is defaulted to size, since we want to insert sequentially 
-            # into None filled spaces in memory until it is full
-            frame, is_fault = self.size, True
+        if page not in self._frames:
+            is_fault = True
 
             if self.is_full:
-                replaced_page, _ = self.state.pop(0)
-                frame = self._memory.index(replaced_page)
-                self.__arrival_queue.remove(replaced_page)
+                replaced_page = self.__evict()
 
-            self._memory[frame] = page
-            self.__frequencies[frame] = 1
-            self.__arrival_queue.append(page)
+            self._place(page, replaced_page)
+            self.__frequencies[page] = 1
+            self.__arrivals[page] = self.__num_arrivals
+            self.__num_arrivals += 1
+            self.__push(1, page)
+            self.__min_frequency = 1
         else:
-            self.__frequencies[self._memory.index(page)] += 1
+            frequency = self.__frequencies[page]
+            self.__frequencies[page] = frequency + 1
+            # The page is pushed first, so that its old bucket is not dropped while the minimum moves past it
+            self.__push(frequency + 1, page)
+            self.__leave(frequency)
         
         return replaced_page, is_fault
@@ -1,4 +1,5 @@
-from typing import List, TypeVar
+from collections import OrderedDict
+from typing import TypeVar
 from .memory import Memory
 
 T = TypeVar("T")
@@ -10,27 +11,27 @@ class LRU(Memory[T]):
 
     def __init__(self, frame_size: int):
         super().__init__(frame_size)
-        self.__usage_queue: List[T] = []
+        # Pages in order of use, from least to most recently used, so that a hit moves its page
+        # to the end and an eviction takes the first page, both in constant time
+        self.__usage_queue: OrderedDict[T, None] = OrderedDict()
 
     @property
     def state(self):
-        return self.__usage_queue
+        """ The pages from least to most recently used, which is only listed when it is looked at. """
+        return list(self.__usage_queue)
 
     def load(self, page: T):
         replaced_page, is_fault = None, False
         
-        if page not in self._memory:
-            # frame is defaulted to size, since we want to insert sequentially 
-            # into None filled spaces in memory until it is full
-            frame, is_fault = self.size, True
+        if page not in self._frames:
+            is_fault = True
 
             if self.is_full:
-                replaced_page = self.state.pop(0)
-                frame = self._memory.index(replaced_page)
+                replaced_page, _ = self.__usage_queue.popitem(last=False)
 
-            self._memory[frame] = page
+            self._place(page, replaced_page)
+            self.__usage_queue[page] = None
         else:
-            self.__usage_queue.remove(page)
+            self.__usage_queue.move_to_end(page)
 
-        self.__usage_queue.append(page)
         return replaced_page, is_fault
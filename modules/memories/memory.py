@@ -1,5 +1,5 @@
 
-from typing import Optional, List, Any, Generic, TypeVar
+from typing import Optional, List, Dict, Any, Generic, TypeVar
 from abc import ABC, abstractmethod
 
 T = TypeVar("T")
@@ -14,6 +14,11 @@ class Memory(ABC, Generic[T]):
         self._capacity: int = frame_size
         self.__iter_ptr: int = 0
 
+        # The frame of each page in memory, and the frames that are free with the lowest on top, so that
+        # memory fills up in order. Both are kept in step with the frames by _place.
+        self._frames: Dict[T, int] = {}
+        self._free_frames: List[int] = list(range(frame_size - 1, -1, -1))
+
     def __eq__(self, other: 'Memory'):
         return self.name == other.name and self.size == other.size and self._capacity == other.capacity and all(a == b for a, b in zip(self._memory, other))
     
@@ -34,7 +39,10 @@ class Memory(ABC, Generic[T]):
 
     def __len__(self):
         """ The current number of frames that is in memory. """
-        return self._capacity - self._memory.count(None)
+        return self._capacity - len(self._free_frames)
+
+    def __contains__(self, page: T):
+        return page in self._frames
     
     def __str__(self):
         return str(self._memory)
@@ -70,9 +78,7 @@ class Memory(ABC, Generic[T]):
             Retrieve the frame number of the given page. It returns -1 
             if the page is not in memory. 
         """
-        if page in self._memory:
-            return self._memory.index(page)
-        return -1
+        return self._frames.get(page, -1)
     
     def frame_label_of(self, page: T, min_padding: int = 3) -> str:
         """ 
@@ -82,8 +88,25 @@ class Memory(ABC, Generic[T]):
         frame = self.frame_of(page)
         if frame == -1:
             return "N/A"
+        return self.frame_label(frame, min_padding)
+
+    def frame_label(self, frame: int, min_padding: int = 3) -> str:
+        """ 
+            Retrieve the padded frame number of the given frame, 
+            for presentation. 
+        """
         return str(frame + 1).zfill(max(min_padding, len(str(self._capacity))))
 
+    def _place(self, page: T, replaced_page: Optional[T] = None) -> int:
+        """
+            Puts a page into memory, in the frame of the page that it replaces, or else
+            in the lowest free frame. It returns the frame that the page was put in.
+        """
+        frame = self._frames.pop(replaced_page) if replaced_page is not None else self._free_frames.pop()
+        self._memory[frame] = page
+        self._frames[page] = frame
+        return frame
+
     @abstractmethod
     def load(self, page: T) -> tuple[Optional[int], bool]:
         """ 
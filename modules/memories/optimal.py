@@ -1,5 +1,6 @@
 from copy import deepcopy
-from typing import List, TypeVar
+from heapq import heapify, heappop, heappush
+from typing import Any, Dict, List, Tuple, TypeVar
 from .memory import Memory
 
 T = TypeVar("T")
@@ -11,37 +12,81 @@ class Optimal(Memory[T]):
 
     def __init__(self, frame_size: int, pages: List[T]):
         super().__init__(frame_size)
-        self.__pages: List[T] = deepcopy(pages)
-        self.__arrival_queue: List[T] = []
+        # The position of the next reference to the same page after each reference, found in one pass from the back,
+        # where pages that are not referenced again are used next at the end of the pages
+        self.__never: int = len(pages)
+        self.__next_uses: List[int] = [self.__never] * len(pages)
+        # The position of the next reference to each page that has not been loaded yet
+        self.__upcoming: Dict[T, int] = {}
+        for position in range(len(pages) - 1, -1, -1):
+            self.__next_uses[position] = self.__upcoming.get(pages[position], self.__never)
+            self.__upcoming[pages[position]] = position
+
+        self.__arrivals: Dict[T, int] = {}
+        self.__num_arrivals: int = 0
+        # The pages in memory as a heap of (-next use, arrival, page), so that the page used furthest ahead, or else
+        # the oldest, is on top. Entries are pushed again when the next use of a page moves, and stale ones are
+        # only dropped once they reach the top.
+        self.__heap: List[Tuple[int, int, T]] = []
+
+    def __deepcopy__(self, memo: Dict[int, Any]):
+        # The next uses never change once they are found, so copies share them rather than copying the whole reference string
+        memo[id(self.__next_uses)] = self.__next_uses
+        copy = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copy
+        copy.__dict__.update(deepcopy(self.__dict__, memo))
+        return copy
 
     @property
     def state(self):
-        mem_items = [page for page in self._memory if page is not None]
-        sort_by_page_interval = lambda p : self.__pages.index(p) if p in self.__pages else len(self.__pages) 
-        sort_by_arrival = lambda p : self.__arrival_queue.index(p)
-        
-        # -1 to sort by arrival in descending order
-        mem_items.sort(key=lambda page : (sort_by_page_interval(page), -1 * sort_by_arrival(page)), reverse=True)
-        return mem_items
+        """ The pages in memory in the order that they would be replaced, which is only sorted when it is looked at. """
+        return sorted(self.__arrivals, key=lambda page : (self.__next_use(page), -self.__arrivals[page]), reverse=True)
+
+    def __next_use(self, page: T):
+        return self.__upcoming.get(page, self.__never)
+
+    def __is_current(self, entry: Tuple[int, int, T]):
+        """ Checks whether an entry of the heap still stands for its page, rather than for one that was loaded again or replaced. """
+        next_use, arrival, page = entry
+        return self.__arrivals.get(page) == arrival and self.__next_use(page) == -next_use
+
+    def __push(self, page: T):
+        heappush(self.__heap, (-self.__next_use(page), self.__arrivals[page], page))
+
+        # Keep pages that are loaded often from filling the heap up with stale entries
+        if len(self.__heap) > 2 * len(self.__arrivals) + 8:
+            self.__heap = [entry for entry in self.__heap if self.__is_current(entry)]
+            heapify(self.__heap)
+
+    def __evict(self) -> T:
+        """ Removes the page that is used furthest ahead. """
+        while not self.__is_current(self.__heap[0]):
+            heappop(self.__heap)
+
+        _, _, page = heappop(self.__heap)
+        del self.__arrivals[page]
+        return page
 
     def load(self, page: T):
         replaced_page, is_fault = None, False
         
         # We only care about the next set of pages
-        if page in self.__pages:
-            self.__pages.remove(page)
+        if page in self.__upcoming:
+            next_use = self.__next_uses[self.__upcoming[page]]
+            if next_use < self.__never:
+                self.__upcoming[page] = next_use
+            else:
+                del self.__upcoming[page]
         
-        if page not in self._memory:
-            # frame is defaulted to size, since we want to insert sequentially 
-            # into None filled spaces in memory until it is full
-            frame, is_fault = self.size, True
+        if page not in self._frames:
+            is_fault = True
 
             if self.is_full:
-                replaced_page = self.state.pop(0)
-                frame = self._memory.index(replaced_page)
-                self.__arrival_queue.remove(replaced_page)
+                replaced_page = self.__evict()
 
-            self._memory[frame] = page
-            self.__arrival_queue.append(page)
-        
+            self._place(page, replaced_page)
+            self.__arrivals[page] = self.__num_arrivals
+            self.__num_arrivals += 1
+
+        self.__push(page)
         return replaced_page, is_fault
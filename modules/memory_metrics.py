@@ -1,13 +1,13 @@
-from typing import List, Generic, TypeVar
-from .memory_snapshot import MemorySnapshot
+from typing import Generic, TypeVar
+from .paging_timeline import PagingTimeline
 
 T = TypeVar("T")
 
 class MemoryMetrics(Generic[T]):
-    def __init__(self, memory_snapshots: List[MemorySnapshot[T]]):
-        self.__snapshot_length = len(memory_snapshots)
-        self.__memory_name = memory_snapshots[0].snapshot.extended_name if self.__snapshot_length > 0 else ""
-        self.__hits = [s.is_hit for s in memory_snapshots].count(True)
+    def __init__(self, paging_timeline: PagingTimeline[T]):
+        self.__snapshot_length = len(paging_timeline)
+        self.__memory_name = paging_timeline.memory_name if self.__snapshot_length > 0 else ""
+        self.__hits = paging_timeline.hits
 
     @property
     def memory_name(self):
@@ -1,18 +1,27 @@
-from copy import deepcopy
-from typing import Optional, Generic, TypeVar
+from typing import Any, List, Optional, Generic, TypeVar, TYPE_CHECKING
 from .memories import Memory
 
+if TYPE_CHECKING:
+    from .paging_timeline import PagingTimeline
+
 T = TypeVar("T")
 
 class MemorySnapshot(Generic[T]):
+    """
+        A step of a paging timeline, which holds only what changed in it. The memory as it was after the step is
+        rebuilt from the nearest checkpoint of the timeline when it is looked at.
+    """
+
     log_legend: str = "[<Time>] <State (After Replacement)> <Replacement Log>"
 
-    def __init__(self, snap_time: int, memory: Memory[T], inserted_page: T, replaced_page: Optional[T], is_fault: bool):
+    def __init__(self, snap_time: int, inserted_page: T, frame: int, replaced_page: Optional[T], is_fault: bool, timeline: 'PagingTimeline[T]', step: int):
         self.__snapped_on: int = snap_time
-        self.__memory: Memory[T] = deepcopy(memory)
         self.__inserted_page: T = inserted_page
+        self.__frame: int = frame
         self.__replaced_page: Optional[T] = replaced_page
         self.__is_fault: bool = is_fault
+        self.__timeline: 'PagingTimeline[T]' = timeline
+        self.__step: int = step
 
     @property
     def is_hit(self):
@@ -31,19 +40,40 @@ class MemorySnapshot(Generic[T]):
         return self.__snapped_on
 
     @property
-    def snapshot(self):
-        return self.__memory
+    def inserted_page(self):
+        return self.__inserted_page
+
+    @property
+    def frame(self):
+        """ The frame that the inserted page is in after the step. """
+        return self.__frame
+
+    @property
+    def replaced_page(self):
+        return self.__replaced_page
+
+    @property
+    def snapshot(self) -> Memory[T]:
+        """ The memory after the step, which is rebuilt from the checkpoint before it every time it is looked at. """
+        return self.__timeline.memory_at(self.__step)
+
+    @property
+    def frames(self) -> List[Optional[T]]:
+        """ The page in each frame after the step, which is cheaper to rebuild than the whole memory. """
+        return self.__timeline.frames_at(self.__step)
 
-    def log(self, state_log_pad: Optional[int] = None, time_log_pad: Optional[int] = None):
+    def log(self, state_log_pad: Optional[int] = None, time_log_pad: Optional[int] = None, state: Any = None):
+        """ Describes the step. The state of the memory can be given, so that it is not rebuilt for the log (e.g. from the states of the timeline). """
         status = "❌ FAULT " if self.__is_fault else "🎯 HIT   "
         action = "loaded" if self.__is_fault else "found"
+        state = self.snapshot.state if state is None else state
         
         page_inserted = "Page {}".format(self.__inserted_page)
-        involved_frame = "Frame {}".format(str(self.__memory.frame_of(self.__inserted_page) + 1).zfill(3))
+        involved_frame = "Frame {}".format(str(self.__frame + 1).zfill(3))
         replaced_clause = " replacing page {}".format(self.__replaced_page) if self.__replaced_page is not None else ""
 
         replacement_log = "{}: {} {} in {}{}".format(status, page_inserted, action, involved_frame, replaced_clause)
-        state_log = "{:>{}}".format(str(self.__memory.state), state_log_pad) if state_log_pad is not None else str(self.__memory.state) 
+        state_log = "{:>{}}".format(str(state), state_log_pad) if state_log_pad is not None else str(state) 
         time_log = "{:>{}}".format("[{}]".format(self.__snapped_on), time_log_pad + 2) if time_log_pad is not None else "[{}]".format(self.__snapped_on) 
 
         return "{} {} {}".format(time_log, state_log, replacement_log)
\ No newline at end of file
@@ -0,0 +1,105 @@
+from array import array
+from copy import deepcopy
+from typing import Generic, Iterator, List, Optional, TypeVar
+
+from .memories import Memory
+from .memory_snapshot import MemorySnapshot
+
+T = TypeVar("T")
+
+class PagingTimeline(Generic[T]):
+    """
+        Records the page references loaded into a memory as deltas, in parallel columns of the inserted page, the frame
+        it is in, the replaced page, and whether it was a fault. A copy of the whole memory, along with the state of its
+        algorithm, is kept as a checkpoint every given number of steps, which defaults to the capacity of the memory (and
+        at least 100), so that the checkpoints take no more room than the deltas. The memory or its frames at any step are
+        rebuilt from the checkpoint before it, by loading the pages after it again. The deltas are read back as
+        MemorySnapshot records.
+    """
+
+    def __init__(self, memory: Memory[T], start_time: int = 1, checkpoint_interval: Optional[int] = None):
+        if checkpoint_interval is not None and checkpoint_interval < 1:
+            raise ValueError("Checkpoints should be at least 1 step apart.")
+
+        self.__memory: Memory[T] = memory
+        self.__start_time: int = start_time
+        self.__checkpoint_interval: int = checkpoint_interval if checkpoint_interval is not None else max(100, memory.capacity)
+
+        self.__inserted_pages: List[T] = []
+        self.__frames = array("q")
+        self.__replaced_pages: List[Optional[T]] = []
+        self.__faults = bytearray()
+        # The memory as of the first step, and as of every checkpoint interval of steps from it
+        self.__checkpoints: List[Memory[T]] = [deepcopy(memory)]
+
+    def __len__(self):
+        return len(self.__frames)
+
+    def __getitem__(self, idx: int):
+        if idx < 0:
+            idx += len(self.__frames)
+        if not 0 <= idx < len(self.__frames):
+            raise IndexError("The timeline has no step at {}.".format(idx))
+        return self.__snapshot_at(idx)
+
+    def __iter__(self) -> Iterator[MemorySnapshot[T]]:
+        return (self.__snapshot_at(idx) for idx in range(len(self.__frames)))
+
+    def __snapshot_at(self, idx: int):
+        return MemorySnapshot(self.__start_time + idx, self.__inserted_pages[idx], self.__frames[idx], self.__replaced_pages[idx], bool(self.__faults[idx]), self, idx)
+
+    @property
+    def memory_name(self):
+        return self.__memory.extended_name
+
+    @property
+    def hits(self):
+        return len(self.__faults) - self.__faults.count(1)
+
+    def load(self, page: T):
+        """ Loads a page into the memory and records the step. It returns the replaced page and whether it was a fault, like the memory does. """
+        replaced_page, is_fault = self.__memory.load(page)
+
+        frame = self.__memory.frame_of(page)
+        self.__inserted_pages.append(page)
+        self.__frames.append(frame)
+        self.__replaced_pages.append(replaced_page)
+        self.__faults.append(is_fault)
+
+        if len(self.__frames) % self.__checkpoint_interval == 0:
+            self.__checkpoints.append(deepcopy(self.__memory))
+
+        return replaced_page, is_fault
+
+    def memory_at(self, idx: int) -> Memory[T]:
+        """ Rebuilds the memory as it was after a step, by loading the pages after the checkpoint before it again. The memory is a copy of its own. """
+        checkpoint = (idx + 1) // self.__checkpoint_interval
+        memory = deepcopy(self.__checkpoints[checkpoint])
+        for step in range(checkpoint * self.__checkpoint_interval, idx + 1):
+            memory.load(self.__inserted_pages[step])
+
+        return memory
+
+    def frames_at(self, idx: int) -> List[Optional[T]]:
+        """ Rebuilds the pages in each frame after a step, from the frames of the checkpoint before it and the deltas after it. """
+        checkpoint = (idx + 1) // self.__checkpoint_interval
+        frames = list(self.__checkpoints[checkpoint])
+        for step in range(checkpoint * self.__checkpoint_interval, idx + 1):
+            frames[self.__frames[step]] = self.__inserted_pages[step]
+
+        return frames
+
+    def frame_history(self, frame: int) -> Iterator[Optional[T]]:
+        """ Retrieves the page in a frame after each step, going over the deltas once. """
+        page = self.__checkpoints[0][frame]
+        for step, step_frame in enumerate(self.__frames):
+            if step_frame == frame:
+                page = self.__inserted_pages[step]
+            yield page
+
+    def states(self):
+        """ Retrieves the state of the memory after each step, by loading every page again into a copy of the memory it started as. """
+        memory = deepcopy(self.__checkpoints[0])
+        for page in self.__inserted_pages:
+            memory.load(page)
+            yield memory.state
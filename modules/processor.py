@@ -1,7 +1,7 @@
-from typing import Optional, Callable, List
+from typing import Optional, Callable
 
 from utils.signal import Signal
-from models import Process, ProcessLog
+from models import Process, ProcessState, ProcessTimeline, IDLE_PID
 from .clock import Clock
 
 class Processor:
@@ -11,7 +11,7 @@ class Processor:
         
         self.__idle_time: int = 0
         self.__current_process: Optional[Process] = None
-        self.__process_logs: List[ProcessLog] = []
+        self.__process_logs: ProcessTimeline = ProcessTimeline()
 
         self.__tick_signal = Signal[Process]()
         self.__clear_signal = Signal[Process]()
@@ -23,20 +23,17 @@ class Processor:
     @property
     def __last_log_end_time(self):
         """ Retrieves the end time of the last item in the execution timeline."""
-        return self.__process_logs[-1].end if len(self.__process_logs) > 0 else self.__start_time
+        return self.__process_logs.last_end if len(self.__process_logs) > 0 else self.__start_time
 
     def __record_cleared_process(self, cleared_process: Process):
         """ Records the cleared process to the logs. """
-        log = ProcessLog(str(cleared_process.pid), self.__last_log_end_time, self.__clock.time, tag=cleared_process.queue_level)
-        self.__process_logs.append(log)
+        self.__process_logs.append(cleared_process.pid, self.__last_log_end_time, self.__clock.time, tag=cleared_process.queue_level)
 
     def __record_idle_time(self, loaded_process: Process):
         """ Records the idle time to the execution timeline. """
         if self.__last_log_end_time < self.__clock.time:
             self.__idle_time += self.__clock.time - self.__last_log_end_time
-            
-            log = ProcessLog("idle", self.__last_log_end_time, self.__clock.time, tag=loaded_process.queue_level)
-            self.__process_logs.append(log)
+            self.__process_logs.append(IDLE_PID, self.__last_log_end_time, self.__clock.time, tag=loaded_process.queue_level)
     
     @property
     def is_idle(self):
@@ -56,7 +53,7 @@ class Processor:
     
     @property
     def process_dump(self):
-        """ Retrieve the logs of the processes that were processed by the processor. """
+        """ Retrieve the logs of the processes that were processed by the processor, which can be iterated as ProcessLog records. """
         return self.__process_logs
 
     @property
@@ -64,23 +61,29 @@ class Processor:
         return self.__current_process
     
     def run(self, time_quantum = 1):
-        """ Runs the processor by a given time quantum. """
-        for _ in range(time_quantum):
-            if self.__current_process is not None and not self.__current_process.is_depleted:
-                self.__current_process.tick()
-                self.__tick_signal.emit(self.__current_process)
+        """ 
+            Runs the loaded process by a given time quantum in one go, or until it is depleted, 
+            whichever comes first. Listeners of the tick are notified once with the elapsed time, 
+            so the time quantum should not go past the time window enforced by the scheduler.
+        """
+        if self.__current_process is not None and not self.__current_process.is_depleted:
+            elapsed = min(time_quantum, self.__current_process.burst_remaining)
+            self.__current_process.tick(elapsed)
+            self.__tick_signal.emit(self.__current_process, elapsed)
     
-    def on_tick(self, fn: Callable[[Process], None]):
-        """ Adds a function to listen whenever the processor does a tick. """
+    def on_tick(self, fn: Callable[[Process, int], None]):
+        """ Adds a function to listen whenever the processor runs, which receives the running process and the elapsed time. """
         self.__tick_signal.listen(fn)
     
-    def off_tick(self, fn: Callable[[Process], None]):
+    def off_tick(self, fn: Callable[[Process, int], None]):
         """ Removes a function listening to the processor tick. """
         self.__tick_signal.ignore(fn)
 
     def load(self, process: Process):
         """ Loads a process onto the processor for processing. """ 
         self.__current_process = process
+        self.__current_process.state = ProcessState.RUNNING
+        self.__current_process.mark_dispatched_on(self.__clock.time)
         self.__process_add_signal.emit(self.__current_process)
 
     def on_load(self, fn: Callable[[Process], None]):
@@ -97,6 +100,7 @@ class Processor:
         
         if self.__current_process is not None:
             cleared_process = self.__current_process
+            cleared_process.state = ProcessState.WAITING
             self.__current_process = None
             self.__clear_signal.emit(cleared_process)
 
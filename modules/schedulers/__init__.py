@@ -1,3 +1,4 @@
+from .ready_queue import ReadyQueue, FIFOReadyQueue, PriorityReadyQueue
 from .scheduler import Scheduler
 from .fcfs import FCFS
 from .sjf import SJF
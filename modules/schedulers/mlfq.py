@@ -1,6 +1,7 @@
-from typing import List, Callable
+from functools import partial
+from typing import List, Callable, Optional
 
-from models import Process
+from models import Process, ProcessState, ProcessTable
 from modules import Processor
 from ..schedulers import Scheduler, FCFS, SJF, PriorityNP, RoundRobin
 
@@ -12,9 +13,12 @@ class MLFQ(Scheduler):
         super().__init__(processes, processor)
         self.__layers: List[Scheduler] = []
 
-        for p in processes:
-            # -1 signifies unqueued processes
-            p.queue_level = -1
+        # -1 signifies unqueued processes
+        if isinstance(processes, ProcessTable):
+            processes.fill(queue_level=-1)
+        else:
+            for p in processes:
+                p.queue_level = -1
 
         # Initialize the layers
         for layer_num, time_quantum in enumerate(time_quantums):
@@ -22,8 +26,8 @@ class MLFQ(Scheduler):
             layer = rr_instance(processes if layer_num == 0 else [], processor)
             
             # Ensures that only the running round robin is ticking its time window
-            # The l = layer is a workaround to keep the layer block scoped, as layer is local scoped 
-            self._processor.on_clear(lambda _, l = layer : self._processor.off_tick(l.decrement_time_window))
+            # A bound method rather than a lambda is subscribed, so that the scheduler can be pickled
+            self._processor.on_clear(layer.stop_time_window)
             self.__layers.append(layer)
         
         self.__layers.append(last_layer(processes, processor)) 
@@ -35,9 +39,13 @@ class MLFQ(Scheduler):
     @classmethod
     def factory(cls, time_quantums: List[int], last_layer: Callable[[List[Process], Processor], Scheduler]):
         """ A method that returns a partially instantiated scheduler that can be latched onto the operating system for use. """
-        partialized_instance: Callable[[List[Process], Processor], cls] = lambda pl, p : cls(pl, p, time_quantums, last_layer)
+        partialized_instance: Callable[[List[Process], Processor], cls] = partial(cls, time_quantums=time_quantums, last_layer=last_layer)
         return partialized_instance
 
+    @property
+    def layers(self):
+        return list(self.__layers)
+
     @property
     def round_robin_layers(self) -> List[RoundRobin]:
         return self.__layers[:-1] # pyright: ignore[reportGeneralTypeIssues]
@@ -46,8 +54,32 @@ class MLFQ(Scheduler):
     def last_layer(self):
         return self.__layers[-1]
 
-    def is_queued(self, process: Process):
-        return any(process in layer._ready_queue for layer in self.__layers)
+    @property
+    def time_window_remaining(self):
+        if self._processor.is_idle:
+            return None
+        return self.__layers[self._processor.current_process.queue_level].time_window_remaining
+
+    def admit(self, process: Process):
+        # Processes that were already run keep their queue level when they are moved from another core
+        if process.first_dispatch is None:
+            process.queue_level = -1
+        super().admit(process)
+
+    def steal(self) -> Optional[Process]:
+        while len(self._arrived) > 0:
+            process = self._arrived.pop()
+            if process.state is ProcessState.WAITING:
+                return process
+
+        # Take from the lowest layer first, and move the process up a level, since enqueuing it again moves it back down
+        for layer in reversed(self.__layers):
+            process = layer.steal()
+            if process is not None:
+                process.queue_level -= 1
+                return process
+
+        return None
 
     def enqueue(self, *processes: Process):
         # Queue the arrived processes to their next queue levels
@@ -1,6 +1,7 @@
-from typing import List, Callable
+from functools import partial
+from typing import List, Callable, Optional
 
-from models import Process
+from models import Process, ProcessTable
 from modules import Processor
 from ..schedulers import Scheduler, FCFS, SJF, PriorityNP, Priority, RoundRobin, SRTF
 
@@ -8,19 +9,23 @@ class MLQ(Scheduler):
     name: str = "Multilevel Queue (MLQ)"
     has_queue_level_field: bool = True
     is_multilevel: bool = True
+    preempts_on_arrival: bool = True
 
     def __init__(self, processes: List[Process], processor: Processor, layers: List[Callable[[List[Process], Processor], Scheduler]]):
         super().__init__(processes, processor)
         self.__layers: List[Scheduler] = []
 
         for ql, layer in enumerate(layers):
-            ql_processes = [p for p in processes if p.queue_level == ql]
+            if isinstance(processes, ProcessTable):
+                ql_processes = processes.where(queue_level=ql)
+            else:
+                ql_processes = [p for p in processes if p.queue_level == ql]
             layer_instance = layer(ql_processes, processor)
             
             if isinstance(layer_instance, RoundRobin):
                 # Ensures that when two or more round robins exists, only the running round robin is ticking its time window
-                # The l = layer is a workaround to keep the layer block scoped, as layer is local scoped 
-                self._processor.on_clear(lambda _, l = layer_instance : self._processor.off_tick(l.decrement_time_window))
+                # A bound method rather than a lambda is subscribed, so that the scheduler can be pickled
+                self._processor.on_clear(layer_instance.stop_time_window)
 
             self.__layers.append(layer_instance)
 
@@ -31,13 +36,38 @@ class MLQ(Scheduler):
     @classmethod
     def factory(cls, layers: List[Callable[[List[Process], Processor], Scheduler]]):
         """ A method that returns a partially instantiated scheduler that can be latched onto the operating system for use. """
-        partialized_instance: Callable[[List[Process], Processor], cls] = lambda pl, p : cls(pl, p, layers)
+        partialized_instance: Callable[[List[Process], Processor], cls] = partial(cls, layers=layers)
         return partialized_instance
 
-    def is_queued(self, process: Process):
-        return any(process in layer._ready_queue for layer in self.__layers)
+    @property
+    def layers(self):
+        return list(self.__layers)
 
-    def run(self, timestamp: int, is_allowed_to_preempt: bool = True) -> List[Process]:
+    @property
+    def time_window_remaining(self):
+        if self._processor.is_idle:
+            return None
+        return self.__layers[self._processor.current_process.queue_level].time_window_remaining
+
+    def defer(self, process: Process):
+        self.__layers[process.queue_level].defer(process)
+
+    def admit(self, process: Process):
+        # The multilevel queue looks at the arrived processes to preempt, while its layers admit them
+        self._arrived.append(process)
+        self.__layers[process.queue_level].admit(process)
+
+    def steal(self) -> Optional[Process]:
+        # Take from the lowest layer first, since those processes would have waited the longest here
+        for layer in reversed(self.__layers):
+            process = layer.steal()
+            if process is not None:
+                self._arrived = [p for p in self._arrived if p is not process]
+                return process
+
+        return None
+
+    def run(self, timestamp: int, is_allowed_to_preempt: bool = True):
         current_layer = self.__layers[self._processor.current_process.queue_level] if self._processor.is_occupied else None
         arrived_processes = self.get_arrived_processes(timestamp)
 
@@ -52,6 +82,8 @@ class MLQ(Scheduler):
                 # Preserve the time window if the round robin was not able to fully allow a process to completely run
                 if isinstance(current_layer, RoundRobin) and not current_layer.is_time_window_consumed:
                     current_layer.requeue(preempted_process)
+                else:
+                    current_layer.defer(preempted_process)
                 
                 current_layer = None
 
@@ -1,13 +1,18 @@
 from models import Process
 from .scheduler import Scheduler
+from .ready_queue import PriorityReadyQueue
 
 class PriorityNP(Scheduler):
     name: str = "Priority Non-Preemptive (Prio-NP)"
     has_priority_field: bool = True
 
-    def enqueue(self, *processes: Process):
-        self._ready_queue.extend(processes)
-        self._ready_queue.sort(key=lambda p : (p.priority, p.burst, p.arrival, p.pid))
+    @staticmethod
+    def dispatch_key(p: Process):
+        """ The order that ready processes are dispatched in, from the smallest key. """
+        return (p.priority, p.burst, p.arrival, p.pid)
+
+    def _create_ready_queue(self):
+        return PriorityReadyQueue(key=self.dispatch_key)
     
     def run(self, timestamp: int, is_allowed_to_preempt: bool = False):
         if self._processor.is_idle:
@@ -0,0 +1,93 @@
+from collections import deque
+from heapq import heappush, heappop
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Tuple
+from abc import ABC, abstractmethod
+
+from models import Process
+
+class ReadyQueue(ABC):
+    """ A queue of processes that are ready to be dispatched onto the processor. """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """ The number of processes in the queue. """
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Process]:
+        """ Iterates through the processes in the order that they would be dispatched. """
+        pass
+
+    @abstractmethod
+    def push(self, process: Process):
+        """ Adds a process to the queue. """
+        pass
+
+    @abstractmethod
+    def pop(self) -> Process:
+        """ Removes the process at the head of the queue, and returns it to the caller. """
+        pass
+
+    @abstractmethod
+    def peek(self) -> Process:
+        """ Retrieves the process at the head of the queue without removing it. """
+        pass
+
+    def extend(self, processes: Iterable[Process]):
+        """ Adds a set of processes to the queue. """
+        for p in processes:
+            self.push(p)
+
+class FIFOReadyQueue(ReadyQueue):
+    """ A ready queue backed by a deque, that dispatches processes in the order that they were added. """
+
+    def __init__(self):
+        self.__queue: Deque[Process] = deque()
+
+    def __iter__(self):
+        return iter(self.__queue)
+
+    def __len__(self):
+        return len(self.__queue)
+
+    def push(self, process: Process):
+        self.__queue.append(process)
+
+    def push_front(self, process: Process):
+        """ Adds a process at the head of the queue, so that it is the next to be dispatched. """
+        self.__queue.appendleft(process)
+
+    def pop(self):
+        return self.__queue.popleft()
+
+    def peek(self):
+        return self.__queue[0]
+
+class PriorityReadyQueue(ReadyQueue):
+    """
+        A ready queue backed by a binary heap, that dispatches the process with the smallest key first.
+        The key of a process is computed once it is pushed, so it should not change while it is queued.
+    """
+
+    def __init__(self, key: Callable[[Process], Any]):
+        self.__key: Callable[[Process], Any] = key
+        # The counter breaks ties between equal keys, so that processes are never compared
+        self.__counter: int = 0
+        self.__heap: List[Tuple[Any, int, Process]] = []
+
+    def __iter__(self):
+        return (p for _, _, p in sorted(self.__heap))
+
+    def __len__(self):
+        return len(self.__heap)
+
+    def push(self, process: Process):
+        heappush(self.__heap, (self.__key(process), self.__counter, process))
+        self.__counter += 1
+
+    def pop(self):
+        _, _, process = heappop(self.__heap)
+        return process
+
+    def peek(self):
+        return self.__heap[0][2]
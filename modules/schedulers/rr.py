@@ -1,6 +1,7 @@
+from functools import partial
 from typing import Callable, List
 
-from models import Process
+from models import Process, ProcessState
 from modules import Processor
 from .scheduler import Scheduler
 
@@ -18,7 +19,7 @@ class RoundRobin(Scheduler):
     @classmethod
     def factory(cls, time_quantum: int, is_decrement_automatic: bool = False):
         """ A method that returns a partially instantiated scheduler that can be latched onto the operating system for use. """
-        partialized_instance: Callable[[List[Process], Processor], cls] = lambda pl, p : cls(pl, p, time_quantum, is_decrement_automatic)
+        partialized_instance: Callable[[List[Process], Processor], cls] = partial(cls, time_quantum=time_quantum, is_decrement_automatic=is_decrement_automatic)
         return partialized_instance
 
     @property
@@ -26,23 +27,32 @@ class RoundRobin(Scheduler):
         """ Checks whether the time window has been fully consumed by the running process. """
         return self.__time_window == 0
 
-    def decrement_time_window(self, current_process: Process):
-        """ Decrements the time window as long as there is a process being processed. """
-        self.__time_window -= 1
+    @property
+    def time_window_remaining(self):
+        return self.__time_window
+
+    def decrement_time_window(self, current_process: Process, elapsed: int = 1):
+        """ Decrements the time window by the elapsed time as long as there is a process being processed. """
+        self.__time_window -= elapsed
 
-        if self.__time_window == 0 or current_process.is_depleted:
+        if self.__time_window <= 0 or current_process.is_depleted:
             if not current_process.is_depleted:
                 self._processor.clear()
             
             self.__time_window = self.__time_quantum
     
+    def stop_time_window(self, cleared_process: Process):
+        """ Stops ticking the time window, for when the round robin is a layer that another layer may take the processor from. """
+        self._processor.off_tick(self.decrement_time_window)
+
     def requeue(self, process: Process):
         """ Requeues a process at the start of the queue. """
-        self._ready_queue.insert(0, process)
+        process.state = ProcessState.READY
+        self._ready_queue.push_front(process)
 
     def enqueue(self, *processes: Process):
         # The first sorting condition is just to make sure that previous processes are appended at the end
-        self._ready_queue.extend(sorted(processes, key=lambda p : (0 if p.burst == p.burst_remaining else 1, p.arrival, p.pid)))
+        super().enqueue(*sorted(processes, key=lambda p : (0 if p.burst == p.burst_remaining else 1, p.arrival, p.pid)))
     
     def run(self, timestamp: int, is_allowed_to_preempt: bool = False):
         if self._processor.is_idle:
@@ -1,19 +1,30 @@
-from typing import List, Callable
+from functools import partial
+from typing import List, Callable, Optional, Union
 from abc import ABC, abstractmethod
 
-from models import Process
+from models import Process, ProcessState, ProcessTable
 from ..processor import Processor
+from .ready_queue import ReadyQueue, FIFOReadyQueue
 
 class Scheduler(ABC):
     name: str = "Scheduler"
     has_priority_field: bool = False
     has_queue_level_field: bool = False
     is_multilevel: bool = False
+    preempts_on_arrival: bool = False
 
-    def __init__(self, processes: List[Process], processor: Processor):
-        self._processes: List[Process] = processes
+    def __init__(self, processes: Union[List[Process], ProcessTable], processor: Processor):
+        self._processes: Union[List[Process], ProcessTable] = processes
         self._processor: Processor = processor
-        self._ready_queue: List[Process] = []
+        self._ready_queue: ReadyQueue = self._create_ready_queue()
+
+        # Processes are admitted through a cursor that moves along the processes sorted by arrival
+        if isinstance(processes, ProcessTable):
+            self._arrival_order: Union[List[Process], ProcessTable] = processes.sorted_by_arrival()
+        else:
+            self._arrival_order = sorted(processes, key=lambda p : (p.arrival, p.pid))
+        self._arrival_cursor: int = 0
+        self._arrived: List[Process] = []
 
     def __str__(self):
         return self.name
@@ -25,29 +36,97 @@ class Scheduler(ABC):
             (e.g. time quantum, layers) partially initialized. This ensures that
             when working with other schedulers only process_list and processor are
             required, while still being able to initialize the scheduler with other
-            useful properties.
+            useful properties. Factories are partials of the scheduler class,
+            so that they can be sent to other processes.
         """
-        factory: Callable[[List[Process], Processor], cls] = lambda pl, p : cls(pl, p)
+        factory: Callable[[List[Process], Processor], cls] = partial(cls)
         return factory
 
+    def _create_ready_queue(self) -> ReadyQueue:
+        """ Creates the queue that holds the processes ready to be dispatched, in the order they are dispatched. """
+        return FIFOReadyQueue()
+
+    @property
+    def time_window_remaining(self) -> Optional[int]:
+        """ 
+            The time left before the scheduler forcibly takes the running process off the 
+            processor. It is None for schedulers that do not enforce a time window.
+        """
+        return None
+
+    @property
+    def ready_queue(self):
+        """ The queue of processes that are ready to be dispatched. """
+        return self._ready_queue
+
+    @property
+    def layers(self) -> List['Scheduler']:
+        """ The sub-schedulers of a multilevel scheduler, from the highest queue level. It is empty for other schedulers. """
+        return []
+
     @property
     def waiting_queue(self):
         """ Returns the list of processes that have yet to be processed or ready. """
-        return [p for p in self._processes if not (p.is_marked_completed or self.is_queued(p) or p == self._processor.current_process)]
+        return [p for p in self._processes if p.state is ProcessState.WAITING]
 
     def enqueue(self, *processes: Process):
         """ Adds processes to the ready queue. """
+        for p in processes:
+            p.state = ProcessState.READY
+
         self._ready_queue.extend(processes)
     
     def is_queued(self, process: Process):
         """ Checks whether a given queue is already ready to be processed. """
-        return process in self._ready_queue
+        return process.state is ProcessState.READY
+
+    def defer(self, process: Process):
+        """ Returns a process that was taken off the processor, so that it is admitted again on the next run. """
+        self._arrived.append(process)
+
+    def admit(self, process: Process):
+        """ 
+            Admits a process that was not given to the scheduler when it was created (e.g. a process placed
+            onto one of many cores), so that it is picked up on the next run just like an arrived process.
+        """
+        self._arrived.append(process)
+
+    def steal(self) -> Optional[Process]:
+        """
+            Takes a process that is waiting to be run away from the scheduler, so that another scheduler of
+            the same kind can run it by deferring it. The most recently admitted process is taken first,
+            then the head of the ready queue. It is None if there is no process to take.
+        """
+        while len(self._arrived) > 0:
+            process = self._arrived.pop()
+            if process.state is ProcessState.WAITING:
+                return process
+
+        if len(self._ready_queue) > 0:
+            process = self._ready_queue.pop()
+            process.state = ProcessState.WAITING
+            return process
+
+        return None
+
+    def use_ready_queue(self, ready_queue: ReadyQueue):
+        """ Makes the scheduler share a ready queue with other schedulers (e.g. the global run queue of many cores). """
+        self._ready_queue = ready_queue
 
     def get_arrived_processes(self, timestamp: int):
-        """ Gets all the arrived processes from the waiting queue based on a given timestamp. """
-        return [p for p in self.waiting_queue if p.arrival <= timestamp]
+        """ 
+            Takes all the processes that have arrived by a given timestamp, along with the 
+            deferred ones, that are still waiting to be admitted to the ready queue.
+        """
+        while self._arrival_cursor < len(self._arrival_order) and self._arrival_order[self._arrival_cursor].arrival <= timestamp:
+            self._arrived.append(self._arrival_order[self._arrival_cursor])
+            self._arrival_cursor += 1
+
+        arrived_processes = [p for p in self._arrived if p.state is ProcessState.WAITING]
+        self._arrived = []
+        return arrived_processes
     
     @abstractmethod
-    def run(self, timestamp: int, is_allowed_to_preempt: bool = True) -> List[Process]:
+    def run(self, timestamp: int, is_allowed_to_preempt: bool = True) -> ReadyQueue:
         """ Runs the scheduler at a given timestamp to process the ready queue. """
         pass
\ No newline at end of file
@@ -1,12 +1,17 @@
 from models import Process
 from .scheduler import Scheduler
+from .ready_queue import PriorityReadyQueue
 
 class SJF(Scheduler):
     name: str = "Shortest Job First (SJF)"
 
-    def enqueue(self, *processes: Process):
-        self._ready_queue.extend(processes)
-        self._ready_queue.sort(key=lambda p: (p.burst, p.arrival, p.pid)) 
+    @staticmethod
+    def dispatch_key(p: Process):
+        """ The order that ready processes are dispatched in, from the smallest key. """
+        return (p.burst, p.arrival, p.pid)
+
+    def _create_ready_queue(self):
+        return PriorityReadyQueue(key=self.dispatch_key)
     
     def run(self, timestamp: int, is_allowed_to_preempt: bool = False):
         if self._processor.is_idle:
@@ -1,12 +1,18 @@
 from models import Process
 from .scheduler import Scheduler
+from .ready_queue import PriorityReadyQueue
 
 class SRTF(Scheduler):
     name: str = "Shortest Remaining Time First (SRTF)"
+    preempts_on_arrival: bool = True
 
-    def enqueue(self, *processes: Process):
-        self._ready_queue.extend(processes)
-        self._ready_queue.sort(key=lambda p : (p.burst_remaining, p.arrival, p.pid))
+    @staticmethod
+    def dispatch_key(p: Process):
+        """ The order that ready processes are dispatched in, from the smallest key. """
+        return (p.burst_remaining, p.arrival, p.pid)
+
+    def _create_ready_queue(self):
+        return PriorityReadyQueue(key=self.dispatch_key)
     
     def run(self, timestamp: int, is_allowed_to_preempt: bool = True):
         arrived_processes = self.get_arrived_processes(timestamp)
@@ -0,0 +1,100 @@
+from typing import Any, Dict, Iterable, Optional
+
+from models import Process
+from utils.histogram import LogHistogram
+
+PERCENTILES = (50, 95, 99)
+
+class SchedulingMetrics:
+    """
+        Accumulates the metrics of a scheduling run as processes are dispatched and completed, without going back over
+        the processes. Turnaround, waiting, and response times are counted in histograms, so their percentiles can be
+        estimated in constant memory, and the metrics of separate runs can be merged into one.
+    """
+
+    def __init__(self):
+        self.__turnarounds = LogHistogram()
+        self.__waitings = LogHistogram()
+        self.__responses = LogHistogram()
+
+        self.__context_switches: int = 0
+        self.__last_pid: Optional[int] = None
+        self.__first_arrival: Optional[int] = None
+        self.__last_completion: Optional[int] = None
+
+    def record_load(self, process: Process):
+        """ Counts a context switch whenever the processor loads a process other than the one it last ran. Listens to the processor load. """
+        if self.__last_pid is not None and process.pid != self.__last_pid:
+            self.__context_switches += 1
+        self.__last_pid = process.pid
+
+    def record_completion(self, process: Process):
+        """ Counts the times of a process once it is marked as completed. """
+        self.__turnarounds.add(process.turnaround)
+        self.__waitings.add(process.waiting)
+        self.__responses.add(process.response)
+
+        if self.__first_arrival is None or process.arrival < self.__first_arrival:
+            self.__first_arrival = process.arrival
+        if self.__last_completion is None or process.completion > self.__last_completion:
+            self.__last_completion = process.completion
+
+    def record_completions(self, turnarounds: Iterable[int], waitings: Iterable[int], responses: Iterable[int], first_arrival: int, last_completion: int, context_switches: int):
+        """ Counts the times of a whole run at once, for runs that are computed without dispatching one process at a time. """
+        self.__turnarounds.extend(turnarounds)
+        self.__waitings.extend(waitings)
+        self.__responses.extend(responses)
+        self.__context_switches += context_switches
+
+        self.__first_arrival = first_arrival if self.__first_arrival is None else min(self.__first_arrival, first_arrival)
+        self.__last_completion = last_completion if self.__last_completion is None else max(self.__last_completion, last_completion)
+
+    def merge(self, other: 'SchedulingMetrics'):
+        """ Adds the metrics of another run to these metrics, as if the runs were one. """
+        self.__turnarounds.merge(other.__turnarounds)
+        self.__waitings.merge(other.__waitings)
+        self.__responses.merge(other.__responses)
+        self.__context_switches += other.__context_switches
+
+        if other.__first_arrival is not None:
+            self.__first_arrival = other.__first_arrival if self.__first_arrival is None else min(self.__first_arrival, other.__first_arrival)
+            self.__last_completion = other.__last_completion if self.__last_completion is None else max(self.__last_completion, other.__last_completion)
+
+        return self
+
+    @property
+    def num_completed(self):
+        return len(self.__turnarounds)
+
+    @property
+    def turnaround(self):
+        return self.__turnarounds
+
+    @property
+    def waiting(self):
+        return self.__waitings
+
+    @property
+    def response(self):
+        return self.__responses
+
+    @property
+    def context_switches(self):
+        return self.__context_switches
+
+    @property
+    def throughput(self):
+        """ The number of processes completed per time unit, from the first arrival to the last completion. """
+        if self.__first_arrival is None or self.__last_completion <= self.__first_arrival:
+            return 0.0
+        return self.num_completed / (self.__last_completion - self.__first_arrival)
+
+    def summary(self) -> Dict[str, Any]:
+        """ Retrieves the mean, percentiles, and maximum of each time, along with the throughput and context switches. """
+        summary: Dict[str, Any] = {}
+        for name, histogram in (("turnaround", self.__turnarounds), ("waiting", self.__waitings), ("response", self.__responses)):
+            summary[name] = { "mean": histogram.mean, **{ "p" + str(p): histogram.percentile(p) for p in PERCENTILES }, "max": histogram.max }
+
+        summary["throughput"] = self.throughput
+        summary["context_switches"] = self.__context_switches
+        return summary
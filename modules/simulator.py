@@ -0,0 +1,253 @@
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional, Union
+
+from utils.signal import Signal
+from models import Process, ProcessTable, ProcessTimeline
+from .clock import Clock
+from .processor import Processor
+from .schedulers import Scheduler
+from .scheduling_metrics import SchedulingMetrics
+from .analytic import is_supported, run_analytically
+
+class Simulator:
+    """
+        Simulates a scheduler dispatching processes onto a processor. Rather than ticking
+        the clock one time unit at a time, the clock jumps straight to the next instant
+        where something can happen, which is either the arrival of a process, the completion
+        of the running process, or the expiry of the scheduler's time window.
+
+        Processes can also be streamed in order of arrival from any other iterable (e.g. a workload generator that
+        never stops), in which case they are admitted to the scheduler as they arrive, and are not kept once they
+        are completed. The metrics and timeline of a streamed run are still recorded, but its processes are not,
+        and it can not be checkpointed.
+    """
+
+    def __init__(self, processes: Union[List[Process], ProcessTable, Iterable[Process]], scheduler_factory: Callable[[List[Process], Processor], Scheduler]):
+        self.__stream: Optional[Iterator[Process]] = None
+        if not isinstance(processes, (list, ProcessTable)):
+            self.__stream = iter(processes)
+            processes = []
+
+        self.__processes: Union[List[Process], ProcessTable] = processes
+        self.__clock = Clock(start_time=-1) # -1 = not started
+        self.__processor = Processor(clock=self.__clock)
+        self.__scheduler: Scheduler = scheduler_factory(processes, self.__processor)
+
+        self.__arrivals = array("q", sorted(p.arrival for p in processes))
+        self.__arrival_cursor: int = 0
+        self.__num_uncompleted: int = sum(1 for p in processes if not p.is_marked_completed)
+        # The next process of the stream, which is looked at ahead of its arrival
+        self.__next_streamed: Optional[Process] = next(self.__stream, None) if self.__stream is not None else None
+
+        self.__num_events: int = 0
+        self.__complete_signal = Signal[Process]()
+        self.__metrics = SchedulingMetrics()
+        self.__processor.on_load(self.__metrics.record_load)
+        self.__complete_signal.listen(self.__metrics.record_completion)
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    @property
+    def processor(self):
+        return self.__processor
+
+    @property
+    def scheduler(self):
+        return self.__scheduler
+
+    @property
+    def processes(self):
+        return self.__processes
+
+    @property
+    def metrics(self):
+        """ The metrics accumulated while the simulation runs. """
+        return self.__metrics
+
+    @property
+    def is_finished(self):
+        return self.__num_uncompleted == 0 and self.__next_streamed is None
+
+    def on_complete(self, fn: Callable[[Process], None]):
+        """ Adds a function to listen whenever a process is marked as completed. """
+        self.__complete_signal.listen(fn)
+
+    def off_complete(self, fn: Callable[[Process], None]):
+        """ Removes a function listening to the completion of processes. """
+        self.__complete_signal.ignore(fn)
+
+    def __next_arrival_time(self) -> Optional[int]:
+        """ Retrieves the earliest arrival time that is still ahead of the clock. """
+        if self.__stream is not None:
+            return self.__next_streamed.arrival if self.__next_streamed is not None else None
+
+        while self.__arrival_cursor < len(self.__arrivals) and self.__arrivals[self.__arrival_cursor] <= self.__clock.time:
+            self.__arrival_cursor += 1
+
+        return self.__arrivals[self.__arrival_cursor] if self.__arrival_cursor < len(self.__arrivals) else None
+
+    def __next_event_time(self) -> int:
+        """ Retrieves the time of the next instant where the state of the simulation can change. """
+        now = self.__clock.time
+        candidates = []
+
+        next_arrival = self.__next_arrival_time()
+        if next_arrival is not None:
+            candidates.append(next_arrival)
+
+        if self.__processor.is_occupied:
+            candidates.append(now + self.__processor.current_process.burst_remaining)
+
+            time_window = self.__scheduler.time_window_remaining
+            if time_window is not None and time_window > 0:
+                candidates.append(now + time_window)
+
+        # Falls back to a unit tick, if for some reason there is nothing to look forward to
+        return min(candidates) if len(candidates) > 0 else now + 1
+
+    def __admit_streamed(self):
+        """ Admits the streamed processes that arrived by the current time to the scheduler. """
+        while self.__next_streamed is not None and self.__next_streamed.arrival <= self.__clock.time:
+            process = self.__next_streamed
+            self.__scheduler.admit(process)
+            self.__num_uncompleted += 1
+
+            self.__next_streamed = next(self.__stream, None)
+            if self.__next_streamed is not None and self.__next_streamed.arrival < process.arrival:
+                raise ValueError("Streamed processes should be in order of arrival, but {} arrives before {}.".format(self.__next_streamed.pid, process.pid))
+
+    def step(self):
+        """ Advances the simulation to the next event, and lets the scheduler react to it. """
+        elapsed = self.__next_event_time() - self.__clock.time
+        self.__clock.tick(elapsed)
+        self.__num_events += 1
+
+        if self.__processor.is_occupied:
+            running_process = self.__processor.current_process
+            self.__processor.run(elapsed)
+
+            if self.__processor.is_finished:
+                completed_process = self.__processor.clear()
+                completed_process.mark_completed_on(self.__clock.time)
+                self.__num_uncompleted -= 1
+                self.__complete_signal.emit(completed_process)
+            elif self.__processor.is_idle:
+                # The process was taken off the processor when its time window ran out
+                self.__scheduler.defer(running_process)
+
+        if self.__stream is not None:
+            self.__admit_streamed()
+        ready_queue = self.__scheduler.run(self.__clock.time)
+
+        if len(ready_queue) > 0 and self.__processor.is_idle:
+            process = ready_queue.pop()
+            self.__processor.load(process)
+
+    @property
+    def num_events(self):
+        """ The number of events that the simulation has stepped through. """
+        return self.__num_events
+
+    @property
+    def next_event_time(self):
+        """ The time that the next step advances the simulation to. """
+        return self.__next_event_time()
+
+    def run(self, until: Optional[int] = None):
+        """ Runs the simulation until all processes are completed, or until the next event would go past a given time. """
+        while not self.is_finished:
+            if until is not None and self.next_event_time > until:
+                break
+            self.step()
+
+        return self
+
+class SimulationResult:
+    """ The outcome of a finished simulation, which holds the processes, the execution timeline, and the metrics of the run. """
+
+    def __init__(self, processes: Union[List[Process], ProcessTable], timeline: ProcessTimeline, scheduler_name: str, total_run_time: int, idle_time: int, metrics: SchedulingMetrics):
+        self.__processes: Union[List[Process], ProcessTable] = processes
+        self.__timeline: ProcessTimeline = timeline
+        self.__scheduler_name: str = scheduler_name
+        self.__total_run_time: int = total_run_time
+        self.__idle_time: int = idle_time
+        self.__metrics: SchedulingMetrics = metrics
+
+    @classmethod
+    def from_simulator(cls, simulator: Simulator):
+        """ Creates the result of a finished simulation. """
+        return cls(simulator.processes, simulator.processor.process_dump, simulator.scheduler.name, max(simulator.clock.time, 0), simulator.processor.idle_time, simulator.metrics)
+
+    @property
+    def processes(self):
+        return self.__processes
+
+    @property
+    def timeline(self):
+        """ The execution timeline of the processor, which can be iterated as ProcessLog records. """
+        return self.__timeline
+
+    @property
+    def scheduler_name(self):
+        return self.__scheduler_name
+
+    @property
+    def total_run_time(self):
+        return self.__total_run_time
+
+    @property
+    def idle_time(self):
+        return self.__idle_time
+
+    @property
+    def cpu_utilization(self):
+        """ The ratio of the time that the processor was busy over the total run time. """
+        return (self.__total_run_time - self.__idle_time) / self.__total_run_time if self.__total_run_time > 0 else 0.0
+
+    @property
+    def scheduling_metrics(self):
+        """ The accumulated metrics of the run, which hold the percentiles of each time and can be merged with other runs. """
+        return self.__metrics
+
+    @property
+    def average_turnaround(self):
+        return self.__metrics.turnaround.mean
+
+    @property
+    def average_waiting(self):
+        return self.__metrics.waiting.mean
+
+    @property
+    def average_response(self):
+        return self.__metrics.response.mean
+
+    @property
+    def context_switches(self):
+        """ The number of times that the processor switched from running one process to another. """
+        return self.__metrics.context_switches
+
+    def metrics(self):
+        """ Retrieves the metrics of the run as a dictionary. """
+        return {
+            "total_run_time": self.__total_run_time,
+            "idle_time": self.__idle_time,
+            "cpu_utilization": self.cpu_utilization,
+            "average_turnaround": self.average_turnaround,
+            "average_waiting": self.average_waiting,
+            "average_response": self.average_response,
+            **self.__metrics.summary(),
+        }
+
+def simulate(processes: Union[List[Process], ProcessTable, Iterable[Process]], scheduler_factory: Callable[[List[Process], Processor], Scheduler], allow_analytic: bool = True):
+    """
+        Runs the processes through the scheduler made by the factory until they are completed, without any terminal input or output.
+        Runs on non-preemptive schedulers are computed with NumPy when it is installed, which gives the same result much faster,
+        unless allow_analytic is turned off. Processes that are streamed in order of arrival are always simulated.
+    """
+    if allow_analytic and is_supported(processes, scheduler_factory):
+        timeline, total_run_time, idle_time, metrics = run_analytically(processes, scheduler_factory)
+        return SimulationResult(processes, timeline, scheduler_factory.func.name, total_run_time, idle_time, metrics)
+
+    return SimulationResult.from_simulator(Simulator(processes, scheduler_factory).run())
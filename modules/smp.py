@@ -0,0 +1,477 @@
+from heapq import heapify, heappush, heappop
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from utils.signal import Signal
+from models import Process, ProcessTable, ProcessTimeline, IDLE_PID
+from .clock import Clock
+from .processor import Processor
+from .schedulers import Scheduler
+from .scheduling_metrics import SchedulingMetrics
+
+# How processes are spread across the cores
+#   global   - every core dispatches from one shared ready queue
+#   steal    - each core has its own ready queue, and idle cores take waiting processes from the busiest core
+#   periodic - each core has its own ready queue, and waiting processes are moved to even out the cores at an interval
+#   none     - each core has its own ready queue, and processes stay on the core they were placed on
+BALANCING_MODES = ["global", "steal", "periodic", "none"]
+
+class CoreLoads:
+    """
+        Tracks the number of unfinished processes placed on each core, and finds the least and most loaded
+        cores in logarithmic time through heaps. Entries that went stale are skipped once they reach the top.
+    """
+
+    def __init__(self, num_cores: int):
+        self.__loads = [0] * num_cores
+        self.__least_loaded = [(0, core) for core in range(num_cores)]
+        self.__most_loaded = [(0, core) for core in range(num_cores)]
+
+    def __getitem__(self, core: int):
+        return self.__loads[core]
+
+    def add(self, core: int, amount: int):
+        """ Changes the load of a core by an amount. """
+        self.__loads[core] += amount
+        heappush(self.__least_loaded, (self.__loads[core], core))
+        heappush(self.__most_loaded, (-self.__loads[core], core))
+
+        # Rebuild the heaps once stale entries outnumber the cores, so that they never grow past the number of cores
+        if len(self.__least_loaded) > 4 * len(self.__loads) + 64:
+            self.__least_loaded = [(load, core) for core, load in enumerate(self.__loads)]
+            self.__most_loaded = [(-load, core) for core, load in enumerate(self.__loads)]
+            heapify(self.__least_loaded)
+            heapify(self.__most_loaded)
+
+    def least_loaded(self):
+        """ Retrieves the core with the fewest processes, preferring the lower numbered core on ties. """
+        while self.__least_loaded[0][0] != self.__loads[self.__least_loaded[0][1]]:
+            heappop(self.__least_loaded)
+        return self.__least_loaded[0][1]
+
+    def most_loaded(self):
+        """ Retrieves the core with the most processes, preferring the lower numbered core on ties. """
+        while -self.__most_loaded[0][0] != self.__loads[self.__most_loaded[0][1]]:
+            heappop(self.__most_loaded)
+        return self.__most_loaded[0][1]
+
+class Core:
+    """ A processor along with the scheduler that dispatches onto it, and the metrics of the processes that it ran. """
+
+    def __init__(self, num: int, clock: Clock, scheduler_factory: Callable[[List[Process], Processor], Scheduler]):
+        self.num: int = num
+        self.processor = Processor(clock=clock)
+        # Processes are placed onto the core as they arrive, rather than given up front
+        self.scheduler: Scheduler = scheduler_factory([], self.processor)
+        self.metrics = SchedulingMetrics()
+        self.completed_processes: List[Process] = []
+
+        # The time that the running process was last run up to, and the time of the next event of the core
+        self.last_run_time: int = 0
+        self.event_time: Optional[int] = None
+
+        self.processor.on_load(self.metrics.record_load)
+
+class SMPSimulator:
+    """
+        Simulates a scheduler over many cores that share one clock. Every core has its own processor and its own
+        instance of the scheduler, and the cores either dispatch from one global ready queue, or from ready queues
+        of their own that are balanced by work stealing or at an interval. Like the single core simulator, the clock
+        jumps to the next event, and only the cores where something happens are looked at, so that many cores can be
+        simulated at once.
+    """
+
+    def __init__(self, processes: Union[List[Process], ProcessTable], scheduler_factory: Callable[[List[Process], Processor], Scheduler], num_cores: int, balancing: str = "steal", balance_interval: int = 10):
+        if num_cores < 1:
+            raise ValueError("There should be at least 1 core.")
+        if balancing not in BALANCING_MODES:
+            raise ValueError("{} is not a balancing mode, choose from {}.".format(balancing, ", ".join(BALANCING_MODES)))
+        if balancing == "periodic" and balance_interval < 1:
+            raise ValueError("The balance interval should be at least 1.")
+
+        self.__processes: Union[List[Process], ProcessTable] = processes
+        self.__clock = Clock(start_time=0)
+        self.__cores = [Core(num, self.__clock, scheduler_factory) for num in range(num_cores)]
+        self.__balancing: str = balancing
+        self.__balance_interval: int = balance_interval
+        self.__next_balance_time: int = balance_interval
+
+        if balancing == "global":
+            scheduler = self.__cores[0].scheduler
+            if scheduler.is_multilevel or scheduler.preempts_on_arrival:
+                raise ValueError("A global ready queue only works with schedulers that do not preempt on arrival, and are not multilevel.")
+
+            for core in self.__cores[1:]:
+                core.scheduler.use_ready_queue(scheduler.ready_queue)
+
+        if isinstance(processes, ProcessTable):
+            self.__arrival_order: Union[List[Process], ProcessTable] = processes.sorted_by_arrival()
+        else:
+            self.__arrival_order = sorted(processes, key=lambda p : (p.arrival, p.pid))
+        self.__arrival_cursor: int = 0
+        self.__num_uncompleted: int = len(processes)
+
+        self.__loads = CoreLoads(num_cores)
+        self.__events: List[Any] = []
+        self.__idle_cores: Set[int] = set(range(num_cores))
+        # The idle cores as a heap, to find the lowest numbered ones without going over every core. Cores that
+        # became busy since are skipped once they reach the top.
+        self.__idle_heap: List[int] = list(range(num_cores))
+        self.__num_migrations: int = 0
+        self.__num_events: int = 0
+
+        self.__complete_signal = Signal[Process]()
+
+    @property
+    def clock(self):
+        return self.__clock
+
+    @property
+    def cores(self):
+        return self.__cores
+
+    @property
+    def processes(self):
+        return self.__processes
+
+    @property
+    def balancing(self):
+        return self.__balancing
+
+    @property
+    def num_migrations(self):
+        """ The number of times that a waiting process was moved from one core to another. """
+        return self.__num_migrations
+
+    @property
+    def is_finished(self):
+        return self.__num_uncompleted == 0
+
+    def on_complete(self, fn: Callable[[Process, int], None]):
+        """ Adds a function to listen whenever a process is marked as completed, which receives the process and the number of its core. """
+        self.__complete_signal.listen(fn)
+
+    def off_complete(self, fn: Callable[[Process, int], None]):
+        """ Removes a function listening to the completion of processes. """
+        self.__complete_signal.ignore(fn)
+
+    def __schedule_event(self, core: Core):
+        """ Looks ahead to the next time that the running process of a core completes or runs out of its time window. """
+        core.event_time = None
+        if core.processor.is_occupied:
+            core.event_time = self.__clock.time + core.processor.current_process.burst_remaining
+            time_window = core.scheduler.time_window_remaining
+            if time_window is not None and time_window > 0:
+                core.event_time = min(core.event_time, self.__clock.time + time_window)
+            heappush(self.__events, (core.event_time, core.num))
+
+    def __next_event_time(self):
+        """ Retrieves the time of the next arrival, core event, or balancing. It is None if nothing is ahead. """
+        candidates = []
+
+        if self.__arrival_cursor < len(self.__arrival_order):
+            candidates.append(self.__arrival_order[self.__arrival_cursor].arrival)
+
+        # Skip the events of cores that were rescheduled since
+        while len(self.__events) > 0 and self.__events[0][0] != self.__cores[self.__events[0][1]].event_time:
+            heappop(self.__events)
+        if len(self.__events) > 0:
+            candidates.append(self.__events[0][0])
+
+        if self.__balancing == "periodic" and self.__loads[self.__loads.most_loaded()] > 1:
+            candidates.append(max(self.__next_balance_time, self.__clock.time))
+
+        return min(candidates) if len(candidates) > 0 else None
+
+    def __catch_up(self, core: Core):
+        """ Runs the process on a core up to the current time, since cores are only looked at when something happens to them. """
+        elapsed = self.__clock.time - core.last_run_time
+        core.last_run_time = self.__clock.time
+
+        if core.processor.is_occupied and elapsed > 0:
+            running_process = core.processor.current_process
+            core.processor.run(elapsed)
+
+            if core.processor.is_finished:
+                completed_process = core.processor.clear()
+                completed_process.mark_completed_on(self.__clock.time)
+                core.metrics.record_completion(completed_process)
+                core.completed_processes.append(completed_process)
+                self.__num_uncompleted -= 1
+                self.__loads.add(core.num, -1)
+                self.__complete_signal.emit(completed_process, core.num)
+            elif core.processor.is_idle:
+                # The process was taken off the processor when its time window ran out
+                core.scheduler.defer(running_process)
+
+    def __lowest_idle_cores(self, count: int, skipped_cores: Set[int]):
+        """ Finds up to a count of the lowest numbered idle cores, other than the ones to skip. """
+        found: List[int] = []
+        seen: Set[int] = set()
+        while len(self.__idle_heap) > 0 and len(found) < count:
+            core_num = heappop(self.__idle_heap)
+            if core_num not in self.__idle_cores or core_num in seen:
+                continue
+
+            seen.add(core_num)
+            if core_num not in skipped_cores:
+                found.append(core_num)
+
+        # The cores are still idle until they are dispatched, so they are put back
+        for core_num in seen:
+            heappush(self.__idle_heap, core_num)
+
+        return found
+
+    def __dispatch(self, core_nums: Set[int]):
+        """
+            Lets the schedulers of the given cores react to the current time, then loads the next process onto the
+            ones that are idle. All the schedulers run before any process is loaded, so that the processes that they
+            return to a global ready queue are in it before the cores take from it. With a global ready queue, only
+            as many of the other idle cores are woken up as there are processes left for them, lowest numbered first.
+        """
+        cores = [self.__cores[core_num] for core_num in core_nums]
+        ready_queues = []
+        for core in cores:
+            self.__catch_up(core)
+            ready_queues.append(core.scheduler.run(self.__clock.time))
+
+        if self.__balancing == "global":
+            for core_num in self.__lowest_idle_cores(len(self.__cores[0].scheduler.ready_queue), core_nums):
+                core = self.__cores[core_num]
+                self.__catch_up(core)
+                cores.append(core)
+                ready_queues.append(core.scheduler.run(self.__clock.time))
+
+        for core, ready_queue in sorted(zip(cores, ready_queues), key=lambda item : item[0].num):
+            if len(ready_queue) > 0 and core.processor.is_idle:
+                core.processor.load(ready_queue.pop())
+
+            if core.processor.is_idle:
+                if core.num not in self.__idle_cores:
+                    self.__idle_cores.add(core.num)
+                    heappush(self.__idle_heap, core.num)
+            else:
+                self.__idle_cores.discard(core.num)
+            self.__schedule_event(core)
+
+        # Rebuild the heap once stale entries outnumber the cores, so that it never grows past the number of cores
+        if len(self.__idle_heap) > 4 * len(self.__cores) + 64:
+            self.__idle_heap = sorted(self.__idle_cores)
+
+    def __migrate(self, source: Core, target: Core):
+        """ Moves a waiting process from one core to another. It returns whether there was a process to move. """
+        process = source.scheduler.steal()
+        if process is None:
+            return False
+
+        # Moved processes are placed like arrivals, so that schedulers that preempt on arrival (e.g. MLQ) see them
+        target.scheduler.admit(process)
+        self.__loads.add(source.num, -1)
+        self.__loads.add(target.num, 1)
+        self.__num_migrations += 1
+        return True
+
+    def __steal_for_idle_cores(self):
+        """ Lets each core that has nothing to run take a waiting process from the busiest core, lowest numbered first. It returns the cores that took one. """
+        touched_cores: Set[int] = set()
+        while True:
+            busiest, least_busy = self.__loads.most_loaded(), self.__loads.least_loaded()
+            if self.__loads[least_busy] > 0 or self.__loads[busiest] <= 1 or not self.__migrate(self.__cores[busiest], self.__cores[least_busy]):
+                break
+            touched_cores.add(least_busy)
+
+        return touched_cores
+
+    def __balance(self):
+        """ Moves waiting processes from the busiest cores to the least busy cores, until their loads differ by at most one. It returns the cores that took one. """
+        touched_cores: Set[int] = set()
+        while True:
+            busiest, least_busy = self.__loads.most_loaded(), self.__loads.least_loaded()
+            if self.__loads[busiest] - self.__loads[least_busy] <= 1 or not self.__migrate(self.__cores[busiest], self.__cores[least_busy]):
+                break
+            touched_cores.add(least_busy)
+
+        return touched_cores
+
+    def step(self):
+        """ Advances the simulation to the next event, and lets the cores where something happened react to it. """
+        next_event_time = self.__next_event_time()
+        touched_cores: Set[int] = set()
+        self.__num_events += 1
+
+        if next_event_time is None:
+            # Falls back to a unit tick that looks at every core, if for some reason there is nothing to look forward to
+            next_event_time = self.__clock.time + 1
+            touched_cores.update(range(len(self.__cores)))
+        self.__clock.tick(next_event_time - self.__clock.time)
+
+        while len(self.__events) > 0 and self.__events[0][0] <= self.__clock.time:
+            event_time, core_num = heappop(self.__events)
+            if event_time == self.__cores[core_num].event_time:
+                touched_cores.add(core_num)
+
+        for core_num in touched_cores:
+            self.__catch_up(self.__cores[core_num])
+
+        # Place the arrived processes onto the cores
+        arrived_processes: List[Process] = []
+        while self.__arrival_cursor < len(self.__arrival_order) and self.__arrival_order[self.__arrival_cursor].arrival <= self.__clock.time:
+            arrived_processes.append(self.__arrival_order[self.__arrival_cursor])
+            self.__arrival_cursor += 1
+
+        if self.__balancing == "global":
+            if len(arrived_processes) > 0:
+                self.__cores[0].scheduler.enqueue(*arrived_processes)
+        else:
+            for process in arrived_processes:
+                core_num = self.__loads.least_loaded()
+                self.__loads.add(core_num, 1)
+                self.__cores[core_num].scheduler.admit(process)
+                touched_cores.add(core_num)
+
+        # Processes are moved before the cores are dispatched, so that each core is dispatched once per step, and
+        # a process that was just loaded is not preempted right away by one that was moved onto its core
+        if self.__balancing == "steal":
+            touched_cores.update(self.__steal_for_idle_cores())
+        elif self.__balancing == "periodic" and self.__clock.time >= self.__next_balance_time:
+            touched_cores.update(self.__balance())
+            self.__next_balance_time = self.__clock.time + self.__balance_interval
+
+        self.__dispatch(touched_cores)
+
+    @property
+    def num_events(self):
+        """ The number of events that the simulation has stepped through. """
+        return self.__num_events
+
+    @property
+    def next_event_time(self):
+        """ The time that the next step advances the simulation to. """
+        next_event_time = self.__next_event_time()
+        return next_event_time if next_event_time is not None else self.__clock.time + 1
+
+    def run(self, until: Optional[int] = None):
+        """ Runs the simulation until all processes are completed, or until the next event would go past a given time. """
+        while not self.is_finished:
+            if until is not None and self.next_event_time > until:
+                break
+            self.step()
+
+        return self
+
+class SMPSimulationResult:
+    """ The outcome of a finished multi-core simulation, which holds the timeline and metrics of each core, and of all the cores together. """
+
+    def __init__(self, simulator: SMPSimulator):
+        self.__processes: Union[List[Process], ProcessTable] = simulator.processes
+        self.__scheduler_name: str = simulator.cores[0].scheduler.name
+        self.__balancing: str = simulator.balancing
+        self.__num_migrations: int = simulator.num_migrations
+        self.__total_run_time: int = simulator.clock.time if len(simulator.processes) > 0 else 0
+
+        self.__metrics = SchedulingMetrics()
+        self.__timelines: List[ProcessTimeline] = []
+        self.__core_metrics: List[SchedulingMetrics] = []
+        self.__core_idle_times: List[int] = []
+        self.__core_completed_processes: List[List[Process]] = []
+
+        for core in simulator.cores:
+            timeline = core.processor.process_dump
+            last_end = timeline.last_end if len(timeline) > 0 else 0
+            # Cores that finish early sit idle until the last core finishes, which is added so that the timelines line up
+            if last_end < self.__total_run_time:
+                timeline.append(IDLE_PID, last_end, self.__total_run_time, tag=-1)
+
+            self.__timelines.append(timeline)
+            self.__core_metrics.append(core.metrics)
+            self.__core_idle_times.append(core.processor.idle_time + self.__total_run_time - last_end)
+            self.__core_completed_processes.append(core.completed_processes)
+            self.__metrics.merge(core.metrics)
+
+    @property
+    def processes(self):
+        return self.__processes
+
+    @property
+    def scheduler_name(self):
+        return self.__scheduler_name
+
+    @property
+    def balancing(self):
+        return self.__balancing
+
+    @property
+    def num_cores(self):
+        return len(self.__timelines)
+
+    @property
+    def num_migrations(self):
+        return self.__num_migrations
+
+    @property
+    def total_run_time(self):
+        return self.__total_run_time
+
+    @property
+    def timelines(self):
+        """ The execution timeline of each core, which can be iterated as ProcessLog records. """
+        return self.__timelines
+
+    @property
+    def idle_time(self):
+        """ The idle time of all the cores added together. """
+        return sum(self.__core_idle_times)
+
+    @property
+    def cpu_utilization(self):
+        """ The ratio of the time that the cores were busy over the total time of all the cores. """
+        capacity = self.__total_run_time * self.num_cores
+        return (capacity - self.idle_time) / capacity if capacity > 0 else 0.0
+
+    @property
+    def scheduling_metrics(self):
+        """ The metrics of all the cores merged together. """
+        return self.__metrics
+
+    @property
+    def average_turnaround(self):
+        return self.__metrics.turnaround.mean
+
+    @property
+    def average_waiting(self):
+        return self.__metrics.waiting.mean
+
+    @property
+    def average_response(self):
+        return self.__metrics.response.mean
+
+    def core_metrics(self, core_num: int) -> Dict[str, Any]:
+        """ Retrieves the metrics of one core as a dictionary. """
+        idle_time = self.__core_idle_times[core_num]
+        return {
+            "core": core_num,
+            "completed": len(self.__core_completed_processes[core_num]),
+            "idle_time": idle_time,
+            "cpu_utilization": (self.__total_run_time - idle_time) / self.__total_run_time if self.__total_run_time > 0 else 0.0,
+            **self.__core_metrics[core_num].summary(),
+        }
+
+    def metrics(self):
+        """ Retrieves the metrics of the run as a dictionary, along with the metrics of each core. """
+        return {
+            "num_cores": self.num_cores,
+            "balancing": self.__balancing,
+            "total_run_time": self.__total_run_time,
+            "idle_time": self.idle_time,
+            "cpu_utilization": self.cpu_utilization,
+            "average_turnaround": self.average_turnaround,
+            "average_waiting": self.average_waiting,
+            "average_response": self.average_response,
+            "migrations": self.__num_migrations,
+            **self.__metrics.summary(),
+            "cores": [self.core_metrics(core_num) for core_num in range(self.num_cores)],
+        }
+
+def simulate_smp(processes: Union[List[Process], ProcessTable], scheduler_factory: Callable[[List[Process], Processor], Scheduler], num_cores: int, balancing: str = "steal", balance_interval: int = 10):
+    """ Runs the processes through many cores, each with a scheduler made by the factory, until they are completed. """
+    return SMPSimulationResult(SMPSimulator(processes, scheduler_factory, num_cores, balancing, balance_interval).run())
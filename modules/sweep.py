@@ -0,0 +1,110 @@
+import os
+import json
+import hashlib
+from array import array
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from models import Process, ProcessTable
+from .processor import Processor
+from .schedulers import Scheduler
+from .comparison import compare
+
+# Changing how simulations or their metrics work should bump this, so that stale cached points are not reused
+SWEEP_CACHE_VERSION = 2
+
+def workload_digest(processes: Union[List[Process], ProcessTable]):
+    """ Hashes the fields of a workload that affect a simulation, which identifies the workload in the cache. """
+    digest = hashlib.sha256()
+    fields = array("q")
+    for p in processes:
+        fields.extend((p.pid, p.arrival, p.burst, p.priority, p.queue_level))
+        # Hash in chunks, so that large workloads are not held twice in memory
+        if len(fields) >= 1 << 16:
+            digest.update(fields.tobytes())
+            del fields[:]
+    digest.update(fields.tobytes())
+
+    return digest.hexdigest()
+
+def describe_factory(scheduler_factory: Any) -> Any:
+    """
+        Describes a scheduler factory as plain data, which identifies the configuration in the cache.
+        Factories are partials of scheduler classes, whose arguments may be factories themselves (e.g. layers).
+    """
+    if isinstance(scheduler_factory, partial):
+        return {
+            "scheduler": scheduler_factory.func.__module__ + "." + scheduler_factory.func.__qualname__,
+            "args": [describe_factory(arg) for arg in scheduler_factory.args],
+            "keywords": { name: describe_factory(value) for name, value in sorted(scheduler_factory.keywords.items()) },
+        }
+    elif isinstance(scheduler_factory, (list, tuple)):
+        return [describe_factory(item) for item in scheduler_factory]
+    elif scheduler_factory is None or isinstance(scheduler_factory, (bool, int, float, str)):
+        return scheduler_factory
+
+    raise ValueError("{!r} can not be described, scheduler factories should be made through Scheduler.factory().".format(scheduler_factory))
+
+class SweepCache:
+    """ Stores the metrics of simulated sweep points on disk, with one JSON file per workload and configuration. """
+
+    def __init__(self, directory: str):
+        self.__directory: str = directory
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    def __path(self, key: str):
+        return os.path.join(self.__directory, key + ".json")
+
+    def key(self, workload: str, scheduler_factory: Any):
+        """ Creates the key of a point from the digest of a workload and the description of a factory. """
+        configuration = json.dumps(describe_factory(scheduler_factory), sort_keys=True)
+        return hashlib.sha256("{}:{}:{}".format(SWEEP_CACHE_VERSION, workload, configuration).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """ Retrieves the cached metrics of a point. It is None if the point is missing or unreadable. """
+        try:
+            with open(self.__path(key)) as file:
+                return json.load(file)["metrics"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, metrics: Dict[str, Any]):
+        """ Caches the metrics of a point, replacing the file at once so that readers never see a partial write. """
+        os.makedirs(self.__directory, exist_ok=True)
+        temp_path = self.__path(key) + ".{}.tmp".format(os.getpid())
+        with open(temp_path, "w") as file:
+            json.dump({ "metrics": metrics }, file)
+        os.replace(temp_path, self.__path(key))
+
+def sweep(processes: Union[List[Process], ProcessTable], scheduler_factories: Dict[str, Callable[[List[Process], Processor], Scheduler]], cache_dir: Optional[str] = ".sweep_cache", max_workers: Optional[int] = None):
+    """
+        Simulates the workload on each point of a parameter sweep, given as named scheduler factories, and returns
+        the name and metrics of each point in the given order. Points that were simulated before on the same workload
+        are read from the cache directory, so only new points are simulated, in parallel worker processes.
+        Setting cache_dir to None turns off caching.
+    """
+    cache = SweepCache(cache_dir) if cache_dir is not None else None
+    workload = workload_digest(processes) if cache is not None else ""
+
+    results: Dict[str, Dict[str, Any]] = {}
+    keys: Dict[str, str] = {}
+    missing_factories = {}
+    for name, factory in scheduler_factories.items():
+        if cache is not None:
+            keys[name] = cache.key(workload, factory)
+            metrics = cache.get(keys[name])
+            if metrics is not None:
+                results[name] = metrics
+                continue
+        missing_factories[name] = factory
+
+    if len(missing_factories) > 0:
+        for name, metrics in compare(processes, missing_factories, max_workers):
+            results[name] = metrics
+            if cache is not None:
+                cache.put(keys[name], metrics)
+
+    return [(name, results[name]) for name in scheduler_factories]
@@ -1,36 +1,91 @@
 import os
-from typing import List, Any
-
-from models import Process, ProcessLog
-from modules import Processor, Clock
+import sys
+import shutil
+import json
+import argparse
+from itertools import combinations_with_replacement
+from typing import Dict, List, Any, Optional, TextIO, Tuple, Union
+
+from models import Process, ProcessTable, ProcessTimeline
+from modules import Processor, Simulator, SimulationResult, SMPSimulator, SMPSimulationResult, SchedulingMetrics, Profiler, simulate, simulate_smp, compare, sweep
+from modules.smp import BALANCING_MODES
 from modules.schedulers import FCFS, SJF, PriorityNP, Priority, RoundRobin, SRTF, MLQ, MLFQ
-from views import View, TableView, GanttView
+from views import View, TableView, TableWriter, GanttView
 from utils.io import input_bounded_num
-
-def create_process_execution_gantt(process_dump: List[ProcessLog], layers: List[str] = []):
-    layer_gantts = [GanttView(name="[{}]".format(num), show_timestamps=num == len(layers)) for num, _ in enumerate(layers, start=1)]
-    merged_gantt = GanttView(name="[A]" if len(layers) > 0 else "")
-    for log in process_dump:
-        name = "P" + str(log.name) if type(log.name) == int else log.name
-        time = log.end
-
-        for tag, layer_gantt in enumerate(layer_gantts):
-            layer_gantt.add_item(name if log.tag == tag else "", time)
-
-        merged_gantt.add_item(name, time)
+from utils.workload import load_workload
+from utils.trace import TraceWriter
+
+# The names of the schedulers when they are chosen through the command line
+SCHEDULERS = {
+    "fcfs": FCFS,
+    "sjf": SJF,
+    "prio-np": PriorityNP,
+    "prio-p": Priority,
+    "rr": RoundRobin,
+    "srtf": SRTF,
+    "mlq": MLQ,
+    "mlfq": MLFQ,
+}
+
+def create_process_execution_gantt(process_dump: ProcessTimeline, layers: List[str] = [], window: Tuple[Optional[int], Optional[int]] = (None, None), bucket_size: int = 0):
+    """
+        Charts the timeline within a window of time, along with a chart per layer. With a bucket size, the timeline is
+        zoomed out into buckets of that size instead, which are only charted as a whole.
+    """
+    start_time, end_time = window
+    if bucket_size > 0:
+        return GanttView.from_timeline_buckets(process_dump, bucket_size, start_time, end_time), []
+
+    layer_gantts = [GanttView.from_timeline(process_dump, start_time, end_time, tag=tag, name="[{}]".format(tag + 1), show_timestamps=tag == len(layers) - 1) for tag in range(len(layers))]
+    merged_gantt = GanttView.from_timeline(process_dump, start_time, end_time, name="[A]" if len(layers) > 0 else "")
 
     return merged_gantt, layer_gantts
 
-def create_os_metrics(processes: List[Process], total_run_time: int, total_idle_time: int):
-    metrics = ""
+def render_gantts(merged_gantt: GanttView, layer_gantts: List[GanttView] = [], width: Optional[int] = None):
+    """
+        Prints the charts of the layers above the merged chart, split into pages that fit the width, which defaults to
+        the width of the terminal. The charts are split the same way, so that their pages line up. A width of 0 never splits them.
+    """
+    if width == 0:
+        if len(layer_gantts) > 0:
+            for layer_gantt in layer_gantts:
+                layer_gantt.render()
+            print()
+        merged_gantt.render()
+        return
+
+    breaks = merged_gantt.page_breaks(width if width is not None else shutil.get_terminal_size().columns)
+    layer_pages = [layer_gantt.pages(breaks=breaks) for layer_gantt in layer_gantts]
+    for page_num, merged_page in enumerate(merged_gantt.pages(breaks=breaks)):
+        if page_num > 0:
+            print()
+        if len(layer_pages) > 0:
+            for pages in layer_pages:
+                print(pages[page_num])
+            print()
+        print(merged_page)
+
+def create_os_metrics(metrics: SchedulingMetrics, total_run_time: int, total_idle_time: int):
+    os_metrics = ""
     
-    metrics += "CPU Utilization: {:.2f}%\n".format((float(total_run_time - total_idle_time) / float(total_run_time)) * 100)
-    metrics += "Average TAT: {:.2f}\n".format(sum(p.turnaround for p in processes if p.turnaround is not None) / len(processes))
-    metrics += "Average WT: {:.2f}".format(sum(p.waiting for p in processes if p.waiting is not None) / len(processes))
+    # A workload without processes never runs, so none of its time is used
+    cpu_utilization = float(total_run_time - total_idle_time) / float(total_run_time) if total_run_time > 0 else 0.0
+    os_metrics += "CPU Utilization: {:.2f}%\n".format(cpu_utilization * 100)
+    os_metrics += "Average TAT: {:.2f}\n".format(metrics.turnaround.mean)
+    os_metrics += "Average WT: {:.2f}\n".format(metrics.waiting.mean)
+    os_metrics += "Average RT: {:.2f}\n".format(metrics.response.mean)
+
+    # Percentiles of the times show how long the unluckiest processes took
+    for name, histogram in (("TAT", metrics.turnaround), ("WT", metrics.waiting), ("RT", metrics.response)):
+        os_metrics += "{} p50 / p95 / p99 / max: {} / {} / {} / {}\n".format(name, histogram.percentile(50), histogram.percentile(95), histogram.percentile(99), histogram.max)
+
+    os_metrics += "Throughput: {:.4f} processes per time unit\n".format(metrics.throughput)
+    os_metrics += "Context Switches: {}".format(metrics.context_switches)
     
-    return metrics
+    return os_metrics
 
-def create_process_table_summary(processes: List[Process], has_priority_field: bool, has_queue_level_field: bool):
+def write_process_table_summary(processes: Union[List[Process], ProcessTable], has_priority_field: bool, has_queue_level_field: bool, file: Optional[TextIO] = None, table_format: str = "text"):
+    """ Writes the table of the processes row by row to a file, which defaults to the standard output. """
     table_headers = ["PID", "AT", "BT", "CT", "TAT", "WT"] 
     if has_priority_field:
         # Insert at the index before CT
@@ -42,23 +97,28 @@ def create_process_table_summary(processes: List[Process], has_priority_field: b
         idx = len(table_headers) - 3 
         table_headers.insert(idx, "QL")
 
-    table = TableView(header=table_headers)
-    
-    for p in processes:
-        data = ["P" + str(p.pid), p.arrival, p.burst, p.completion, p.turnaround, p.waiting]
-        if has_priority_field:
-            # Insert at the index before p.completion
-            idx = len(data) - 3 
-            data.insert(idx, p.priority)
-    
-        if has_queue_level_field:
-            # Insert at the index before p.completion
-            idx = len(data) - 3 
-            data.insert(idx, p.queue_level + 1)
+    def create_rows():
+        for p in processes:
+            data = ["P" + str(p.pid), p.arrival, p.burst, p.completion, p.turnaround, p.waiting]
+            if has_priority_field:
+                # Insert at the index before p.completion
+                idx = len(data) - 3 
+                data.insert(idx, p.priority)
+        
+            if has_queue_level_field:
+                # Insert at the index before p.completion
+                idx = len(data) - 3 
+                data.insert(idx, p.queue_level + 1)
+
+            yield data
 
+    # The processes are gone over twice rather than held as rows, once to fit the columns and once to write them
+    cell_widths = TableWriter.fit_widths(create_rows(), header=table_headers) if table_format == "text" else None
+    table = TableWriter(file, header=table_headers, cell_widths=cell_widths, format=table_format)
+    for data in create_rows():
         table.add_item(*data)
     
-    return table
+    table.render()
 
 def configure_mlq(num_layers: int):
     has_priority_field = False
@@ -104,6 +164,59 @@ def configure_mlfq(num_layers: int):
 
     return MLFQ.factory(time_quantums, end_layer.factory()), layer_names, has_priority_field
 
+def create_layer_factory(layer: str):
+    """ Creates the factory of a layer written as a scheduler name, where round robin layers are written as rr:<time quantum>. """
+    name, _, time_quantum = layer.partition(":")
+    layer_scheduler = SCHEDULERS.get(name.lower())
+
+    if layer_scheduler not in MLQ.layer_choices():
+        raise ValueError("{} is not a valid layer, choose from {}.".format(layer, ", ".join(n for n, s in SCHEDULERS.items() if s in MLQ.layer_choices())))
+
+    if layer_scheduler == RoundRobin:
+        if not time_quantum.isdigit() or int(time_quantum) < 1:
+            raise ValueError("Round robin layers need a time quantum of at least 1 (e.g. rr:2).")
+        return RoundRobin.factory(int(time_quantum), False), layer_scheduler.name + " | q=" + time_quantum, False
+
+    return layer_scheduler.factory(), layer_scheduler.name, layer_scheduler.has_priority_field
+
+def create_scheduler_factory(scheduler: str, time_quantum: int = 0, layers: List[str] = [], time_quantums: List[int] = [], last_layer: str = "fcfs"):
+    """ 
+        The non-interactive counterpart of configuring a scheduler. It returns the scheduler factory, 
+        the names of its layers, and whether the priority and queue level fields are used.
+    """
+    chosen_scheduler = SCHEDULERS[scheduler]
+    has_priority_field: bool = chosen_scheduler.has_priority_field
+    has_queue_level_field: bool = chosen_scheduler.has_queue_level_field
+    layer_names: List[str] = []
+
+    if chosen_scheduler == RoundRobin:
+        if time_quantum < 1:
+            raise ValueError("Round robin needs a time quantum of at least 1.")
+        scheduler_factory = RoundRobin.factory(time_quantum, True)
+    elif chosen_scheduler == MLQ:
+        if len(layers) == 0:
+            raise ValueError("Multilevel queues need at least one layer.")
+
+        layer_factories = []
+        for layer in layers:
+            layer_factory, layer_name, layer_has_priority_field = create_layer_factory(layer)
+            layer_factories.append(layer_factory)
+            layer_names.append(layer_name)
+            has_priority_field = has_priority_field or layer_has_priority_field
+        scheduler_factory = MLQ.factory(layer_factories)
+    elif chosen_scheduler == MLFQ:
+        if any(q < 1 for q in time_quantums):
+            raise ValueError("Time quantums should be at least 1.")
+
+        end_layer = SCHEDULERS[last_layer]
+        layer_names = [RoundRobin.name + " | q=" + str(q) for q in time_quantums] + [end_layer.name]
+        has_priority_field = end_layer.has_priority_field
+        scheduler_factory = MLFQ.factory(time_quantums, end_layer.factory())
+    else:
+        scheduler_factory = chosen_scheduler.factory()
+
+    return scheduler_factory, layer_names, has_priority_field, has_queue_level_field
+
 def main():
     print("===== CPU Scheduling Simulator =====")
     
@@ -156,53 +269,383 @@ def main():
         process_list.append(process)
 
     # Simulate a running operating system
-    clock = Clock(start_time=-1) # -1 = not started
-    processor = Processor(clock=clock)
-    scheduler = scheduler_factory(process_list, processor)
-
-    while any(not p.is_marked_completed for p in process_list):
-        clock.tick()
-
-        if processor.is_occupied:
-            processor.run()
-            
-            if processor.is_finished:
-                completed_process = processor.clear()
-                completed_process.mark_completed_on(clock.time) 
-
-        ready_queue = scheduler.run(clock.time)
-
-        if len(ready_queue) > 0 and processor.is_idle:
-            process = ready_queue.pop(0)
-            processor.load(process)
+    result = simulate(process_list, scheduler_factory)
 
     # Print details of the configured scheduler, the results of execution, and metrics
     os.system("cls")
+    print_simulation_report(result, layer_names, has_priority_field, has_queue_level_field, time_quantum)
+
+def print_simulation_report(result: SimulationResult, layer_names: List[str], has_priority_field: bool, has_queue_level_field: bool, time_quantum: int = 0, show_table: bool = True, show_gantt: bool = True, table_format: str = "text", gantt_window: Tuple[Optional[int], Optional[int]] = (None, None), gantt_bucket: int = 0, gantt_width: Optional[int] = None):
     print("===== CPU Scheduling Simulator =====")
-    print("Scheduler: ", scheduler.name, " | q=" + str(time_quantum) if scheduler == RoundRobin else "")
-    if scheduler.is_multilevel:
+    print("Scheduler: ", result.scheduler_name, " | q=" + str(time_quantum) if time_quantum > 0 else "")
+    if len(layer_names) > 0:
         print()
         print("# LAYER CONFIGURATION")
         print(View.numbered_list(layer_names))
     print()
     
-    print("# PROCESS TABLE")
-    table = create_process_table_summary(process_list, has_priority_field, has_queue_level_field)
-    table.render()
+    if show_table:
+        print("# PROCESS TABLE")
+        write_process_table_summary(result.processes, has_priority_field, has_queue_level_field, table_format=table_format)
+        print()
+
+    if show_gantt:
+        print("# GANTT CHART - TIMELINE")
+        merged_gantt, layer_gantts = create_process_execution_gantt(result.timeline, layer_names, gantt_window, gantt_bucket)
+        render_gantts(merged_gantt, layer_gantts, gantt_width)
+        print()
+
+    print("# METRICS")
+    metrics = create_os_metrics(result.scheduling_metrics, total_run_time=result.total_run_time, total_idle_time=result.idle_time)
+    print(metrics)
+
+def create_comparison_configurations(time_quantum: int = 0, layers: List[str] = [], time_quantums: List[int] = [], last_layer: str = "fcfs"):
+    """
+        Creates the scheduler factories to compare, keyed by their display names. Round robin and the multilevel
+        schedulers are only compared when their configuration is given, and the rest are listed as skipped.
+    """
+    scheduler_factories = {}
+    skipped: List[str] = []
+    has_queue_level_field = False
+
+    for name, scheduler in SCHEDULERS.items():
+        if (scheduler == RoundRobin and time_quantum == 0) or (scheduler == MLQ and len(layers) == 0) or (scheduler == MLFQ and len(time_quantums) == 0):
+            skipped.append(name)
+            continue
+
+        scheduler_factory, layer_names, _, uses_queue_level = create_scheduler_factory(name, time_quantum, layers, time_quantums, last_layer)
+        display_name = scheduler.name
+        if scheduler == RoundRobin:
+            display_name += " | q=" + str(time_quantum)
+        elif scheduler.is_multilevel:
+            display_name += " | " + ", ".join(layers if scheduler == MLQ else ["rr:" + str(q) for q in time_quantums] + [last_layer])
+
+        scheduler_factories[display_name] = scheduler_factory
+        has_queue_level_field = has_queue_level_field or (uses_queue_level and scheduler == MLQ)
+
+    return scheduler_factories, skipped, len(layers) if has_queue_level_field else 0
+
+def print_comparison_report(workload: str, results: List[Any], skipped: List[str]):
+    print("===== CPU Scheduler Comparison =====")
+    print("Workload:", workload)
+    print("Legend: Ranked by average TAT, then average WT")
+    if len(skipped) > 0:
+        print("Skipped (not configured):", ", ".join(skipped))
     print()
 
-    print("# GANTT CHART - TIMELINE")
-    merged_gantt, layer_gantts = create_process_execution_gantt(processor.process_dump, layer_names)
-    if len(layer_gantts) > 0:
-        for layer_gantt in layer_gantts:
-            layer_gantt.render()
+    summary_table = TableView(min_cell_width=8, header=["Rank#", "Scheduler", "Avg TAT", "Avg WT", "CPU Util"])
+    for rank, (name, metrics) in enumerate(results, start=1):
+        summary_table.add_item(rank, name, "{:.2f}".format(metrics["average_turnaround"]), "{:.2f}".format(metrics["average_waiting"]), "{:.2f}%".format(metrics["cpu_utilization"] * 100))
+    summary_table.render()
+
+def compare_main(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """ Simulates the workload on every configured scheduler in parallel, and ranks the results. """
+    try:
+        scheduler_factories, skipped, num_layers = create_comparison_configurations(args.time_quantum, args.layers, args.time_quantums, args.last_layer)
+        processes = load_workload(args.workload)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if num_layers > 0 and any(p.queue_level >= num_layers for p in processes):
+        parser.error("Queue levels of the workload should be between 1 and {}, which is the number of layers.".format(num_layers))
+
+    results = compare(processes, scheduler_factories, max_workers=args.workers)
+
+    if args.format == "json":
+        print(json.dumps({
+            "skipped": skipped,
+            "ranking": [{ "rank": rank, "scheduler": name, "metrics": metrics } for rank, (name, metrics) in enumerate(results, start=1)],
+        }))
+    else:
+        print_comparison_report(args.workload, results, skipped)
+
+def parse_int_range(spec: str):
+    """ Parses a comma separated list of whole numbers and ranges written as start-stop[:step] (e.g. 1,2,4-16:4), where ranges include the stop. """
+    values: List[int] = []
+    for item in spec.split(","):
+        bounds, _, step = item.strip().partition(":")
+        start, _, stop = bounds.partition("-")
+        if not start.isdigit() or not (stop == "" or stop.isdigit()) or not (step == "" or step.isdigit()) or step == "0":
+            raise ValueError("{} is not a valid range, write it like 1,2,4-16:4.".format(spec))
+
+        stop = stop if stop != "" else start
+        values.extend(range(int(start), int(stop) + 1, int(step) if step != "" else 1))
+
+    return values
+
+def create_sweep_configurations(quantum_spec: Optional[str], mlfq_quantum_spec: Optional[str], mlfq_depth_spec: str = "2", last_layer: str = "fcfs"):
+    """
+        Creates the points of a sweep, keyed by their display names. Round robin is swept over each of the time quantums,
+        while MLFQ is swept over each depth with every non-decreasing combination of the time quantums for its layers.
+    """
+    scheduler_factories = {}
+
+    if quantum_spec is not None:
+        for time_quantum in parse_int_range(quantum_spec):
+            scheduler_factory, _, _, _ = create_scheduler_factory("rr", time_quantum)
+            scheduler_factories["rr | q=" + str(time_quantum)] = scheduler_factory
+
+    if mlfq_quantum_spec is not None:
+        time_quantum_choices = sorted(set(parse_int_range(mlfq_quantum_spec)))
+        for depth in parse_int_range(mlfq_depth_spec):
+            # Lower layers of an MLFQ usually get longer time quantums, which also keeps the grid small
+            for time_quantums in combinations_with_replacement(time_quantum_choices, depth):
+                scheduler_factory, _, _, _ = create_scheduler_factory("mlfq", time_quantums=list(time_quantums), last_layer=last_layer)
+                scheduler_factories["mlfq | " + ", ".join(["rr:" + str(q) for q in time_quantums] + [last_layer])] = scheduler_factory
+
+    if len(scheduler_factories) == 0:
+        raise ValueError("Sweeps need --sweep-quantums, --sweep-mlfq-quantums, or both.")
+
+    return scheduler_factories
+
+def print_sweep_report(workload: str, results: List[Any]):
+    print("===== CPU Scheduler Parameter Sweep =====")
+    print("Workload:", workload)
+    print("Legend: RT is the response time, and switches are the context switches")
+    print()
+
+    summary_table = TableView(min_cell_width=8, header=["Configuration", "Avg TAT", "Avg WT", "Avg RT", "Switches"])
+    for name, metrics in results:
+        summary_table.add_item(name, "{:.2f}".format(metrics["average_turnaround"]), "{:.2f}".format(metrics["average_waiting"]), "{:.2f}".format(metrics["average_response"]), metrics["context_switches"])
+    summary_table.render()
+
+    if len(results) > 0:
+        best_name, _ = min(results, key=lambda result : (result[1]["average_turnaround"], result[1]["average_waiting"]))
+        print("Best by average TAT:", best_name)
+
+def sweep_main(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """ Simulates the workload over a sweep of round robin and MLFQ parameters, reusing the cached points. """
+    try:
+        scheduler_factories = create_sweep_configurations(args.sweep_quantums, args.sweep_mlfq_quantums, args.sweep_mlfq_depths, args.last_layer)
+        processes = load_workload(args.workload)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    results = sweep(processes, scheduler_factories, cache_dir=None if args.no_cache else args.cache_dir, max_workers=args.workers)
+
+    if args.format == "json":
+        print(json.dumps([{ "configuration": name, "metrics": metrics } for name, metrics in results]))
+    else:
+        print_sweep_report(args.workload, results)
+
+def print_smp_report(result: SMPSimulationResult, layer_names: List[str], has_priority_field: bool, has_queue_level_field: bool, time_quantum: int = 0, show_table: bool = True, show_gantt: bool = True, table_format: str = "text", gantt_window: Tuple[Optional[int], Optional[int]] = (None, None), gantt_bucket: int = 0, gantt_width: Optional[int] = None):
+    print("===== CPU Scheduling Simulator =====")
+    print("Scheduler: ", result.scheduler_name, " | q=" + str(time_quantum) if time_quantum > 0 else "")
+    print("Cores:", result.num_cores, "| Balancing:", result.balancing)
+    if len(layer_names) > 0:
         print()
-    merged_gantt.render()
+        print("# LAYER CONFIGURATION")
+        print(View.numbered_list(layer_names))
     print()
 
+    if show_table:
+        print("# PROCESS TABLE")
+        write_process_table_summary(result.processes, has_priority_field, has_queue_level_field, table_format=table_format)
+        print()
+
+    if show_gantt:
+        print("# GANTT CHART - TIMELINE PER CORE")
+        start_time, end_time = gantt_window
+        for core_num, timeline in enumerate(result.timelines):
+            name = "[C{}]".format(core_num + 1)
+            if gantt_bucket > 0:
+                core_gantt = GanttView.from_timeline_buckets(timeline, gantt_bucket, start_time, end_time, name=name)
+            else:
+                core_gantt = GanttView.from_timeline(timeline, start_time, end_time, name=name)
+            render_gantts(core_gantt, width=gantt_width)
+        print()
+
     print("# METRICS")
-    metrics = create_os_metrics(process_list, total_run_time=clock.time, total_idle_time=processor.idle_time)
+    # The capacity of all the cores is their run time added together
+    metrics = create_os_metrics(result.scheduling_metrics, total_run_time=result.total_run_time * result.num_cores, total_idle_time=result.idle_time)
     print(metrics)
+    print("Migrations: {}".format(result.num_migrations))
+    print()
+
+    print("# METRICS PER CORE")
+    core_table = TableView(min_cell_width=8, header=["Core", "Done", "Idle", "CPU Util", "Avg TAT", "Switches"])
+    for core_num in range(result.num_cores):
+        core_metrics = result.core_metrics(core_num)
+        core_table.add_item("C" + str(core_num + 1), core_metrics["completed"], core_metrics["idle_time"], "{:.2f}%".format(core_metrics["cpu_utilization"] * 100), "{:.2f}".format(core_metrics["turnaround"]["mean"]), core_metrics["context_switches"])
+    core_table.render()
+
+def print_profile_report(summary: Dict[str, Any]):
+    """ Prints where the time of a profiled simulation went, along with the sampled ready queue lengths and signal subscribers. """
+    print()
+    print("# PROFILE")
+    print("Steps:", summary["steps"], "| Times include the phases called within them")
+    phase_table = TableView(min_cell_width=8, header=["Phase", "Calls", "Total ms", "Mean us"])
+    for phase, stats in summary["phases"].items():
+        phase_table.add_item(phase, stats["calls"], "{:.2f}".format(stats["seconds"] * 1e3), "{:.2f}".format(stats["mean_microseconds"]))
+    phase_table.render()
+    print()
+
+    sample_table = TableView(min_cell_width=8, header=["Sampled per step", "Mean", "p50", "p95", "p99", "Max"])
+    for kind, samples in (("queue", summary["ready_queue_lengths"]), ("subscribers", summary["signal_subscribers"])):
+        for label, stats in samples.items():
+            sample_table.add_item("{} {}".format(label, kind), "{:.2f}".format(stats["mean"]), stats["p50"], stats["p95"], stats["p99"], stats["max"])
+    sample_table.render()
+
+def follow_processors(path: str, processors: List[Processor]):
+    """ Writes the timeline of each processor to a trace file while the simulation runs, with one file per core named PATH.<core> when there are many. """
+    trace_writers: List[TraceWriter] = []
+    for core_num, processor in enumerate(processors):
+        trace_writer = TraceWriter(path if len(processors) == 1 else "{}.{}".format(path, core_num))
+        trace_writer.follow(processor)
+        trace_writers.append(trace_writer)
+
+    return trace_writers
+
+def batch_main(argv: Optional[List[str]] = None):
+    """ Runs a simulation of a workload file without prompting, based on command line arguments. """
+    parser = argparse.ArgumentParser(
+        prog="process_scheduling.py",
+        description="Simulates a CPU scheduler over a workload file without prompting.",
+        epilog="Layers are written as scheduler names, with round robin layers written as rr:<time quantum> (e.g. --layers rr:2 fcfs srtf).",
+    )
+    parser.add_argument("workload", help="a .csv or .jsonl file with the fields pid, arrival, burst, priority, and queue_level")
+    parser.add_argument("-s", "--scheduler", choices=SCHEDULERS.keys())
+    parser.add_argument("-q", "--time-quantum", type=int, default=0, help="time quantum of the round robin scheduler")
+    parser.add_argument("--layers", nargs="+", default=[], help="layers of the multilevel queue, from the highest to the lowest")
+    parser.add_argument("--time-quantums", type=int, nargs="+", default=[], help="time quantums of the round robin layers of the multilevel feedback queue")
+    parser.add_argument("--last-layer", choices=[name for name, s in SCHEDULERS.items() if s in MLFQ.last_layer_choices()], default="fcfs", help="last layer of the multilevel feedback queue")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--no-table", action="store_true", help="leave out the process table from the text report")
+    parser.add_argument("--no-gantt", action="store_true", help="leave out the gantt chart from the text report")
+    parser.add_argument("--table-format", choices=TableWriter.FORMATS, default="text", help="format of the process table (defaults to text)")
+    parser.add_argument("--table-file", metavar="PATH", help="write the process table to a file instead of the report")
+    parser.add_argument("--gantt-start", type=int, default=None, help="time that the gantt chart starts from")
+    parser.add_argument("--gantt-end", type=int, default=None, help="time that the gantt chart stops at")
+    parser.add_argument("--gantt-bucket", type=int, default=0, help="zoom the gantt chart out into buckets of this many time units, showing the process that ran the longest and the utilization of each")
+    parser.add_argument("--gantt-width", type=int, default=None, help="width that the gantt chart is split into pages at, where 0 never splits it (defaults to the width of the terminal)")
+    parser.add_argument("--cores", type=int, default=1, help="number of cores to simulate, each with its own instance of the scheduler")
+    parser.add_argument("--balancing", choices=BALANCING_MODES, default="steal", help="how processes are spread across the cores (defaults to steal)")
+    parser.add_argument("--balance-interval", type=int, default=10, help="time between rebalancing the cores when balancing is periodic")
+    parser.add_argument("--compare", action="store_true", help="rank every configured scheduler on the workload instead of simulating one")
+    parser.add_argument("--sweep", action="store_true", help="simulate every point of a round robin or MLFQ parameter sweep instead of one scheduler")
+    parser.add_argument("--sweep-quantums", metavar="RANGE", help="time quantums of round robin to sweep (e.g. 1-8 or 1,2,4-16:4)")
+    parser.add_argument("--sweep-mlfq-quantums", metavar="RANGE", help="time quantums to combine into the round robin layers of MLFQ")
+    parser.add_argument("--sweep-mlfq-depths", metavar="RANGE", default="2", help="numbers of round robin layers of MLFQ to sweep (defaults to 2)")
+    parser.add_argument("--cache-dir", default=".sweep_cache", help="directory where the results of sweep points are cached")
+    parser.add_argument("--no-cache", action="store_true", help="simulate every sweep point without reading or writing the cache")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes used by --compare and --sweep (defaults to the number of CPUs)")
+    parser.add_argument("--profile", action="store_true", help="time the phases of the simulation and report them after the run")
+    parser.add_argument("--profile-json", metavar="PATH", help="write the profile of the simulation to a JSON file")
+    parser.add_argument("--trace", metavar="PATH", help="write the execution timeline to a binary trace file, with one file per core named PATH.<core> when there are many cores")
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers should be at least 1.")
+
+    if args.compare and args.sweep:
+        parser.error("--compare and --sweep can not be used together.")
+
+    if args.compare:
+        compare_main(parser, args)
+        return
+
+    if args.sweep:
+        sweep_main(parser, args)
+        return
+
+    if args.scheduler is None:
+        parser.error("the following arguments are required: -s/--scheduler (unless --compare or --sweep is given)")
+
+    try:
+        scheduler_factory, layer_names, has_priority_field, has_queue_level_field = create_scheduler_factory(args.scheduler, args.time_quantum, args.layers, args.time_quantums, args.last_layer)
+        processes = load_workload(args.workload)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if has_queue_level_field and any(p.queue_level >= len(layer_names) for p in processes):
+        parser.error("Queue levels of the workload should be between 1 and {}, which is the number of layers.".format(len(layer_names)))
+
+    if args.cores < 1:
+        parser.error("--cores should be at least 1.")
+
+    if args.gantt_bucket < 0 or (args.gantt_width is not None and args.gantt_width < 0):
+        parser.error("--gantt-bucket and --gantt-width should not be negative.")
+    # A process table that is written to a file is left out of the report
+    report_options = {
+        "show_table": not args.no_table and args.table_file is None, "show_gantt": not args.no_gantt, "table_format": args.table_format,
+        "gantt_window": (args.gantt_start, args.gantt_end), "gantt_bucket": args.gantt_bucket, "gantt_width": args.gantt_width,
+    }
+
+    # Profiled and traced simulations always go through the simulator, since that is what is profiled, and what the trace follows
+    profiler = Profiler() if args.profile or args.profile_json is not None else None
+
+    if args.cores > 1:
+        try:
+            if profiler is None and args.trace is None:
+                smp_result = simulate_smp(processes, scheduler_factory, args.cores, args.balancing, args.balance_interval)
+            else:
+                smp_simulator = SMPSimulator(processes, scheduler_factory, args.cores, args.balancing, args.balance_interval)
+                if profiler is not None:
+                    profiler.attach(smp_simulator)
+                trace_writers = follow_processors(args.trace, [core.processor for core in smp_simulator.cores]) if args.trace is not None else []
+                smp_result = SMPSimulationResult(smp_simulator.run())
+                # The idle time that lines the cores up at the end is only added by the result
+                for trace_writer in trace_writers:
+                    trace_writer.close()
+        except ValueError as e:
+            parser.error(str(e))
+
+        if args.table_file is not None:
+            with open(args.table_file, "w", newline="") as table_file:
+                write_process_table_summary(smp_result.processes, has_priority_field, has_queue_level_field, table_file, args.table_format)
+
+        if args.format == "json":
+            print(json.dumps({
+                "scheduler": smp_result.scheduler_name,
+                "layers": layer_names,
+                "metrics": smp_result.metrics(),
+                "processes": [{ "pid": p.pid, "arrival": p.arrival, "burst": p.burst, "priority": p.priority, "queue_level": p.queue_level + 1, "completion": p.completion, "turnaround": p.turnaround, "waiting": p.waiting } for p in smp_result.processes],
+                "timelines": [[{ "name": log.name, "start": log.start, "end": log.end, "tag": log.tag } for log in timeline] for timeline in smp_result.timelines],
+                **({ "profile": profiler.summary() } if args.profile else {}),
+            }))
+        else:
+            print_smp_report(smp_result, layer_names, has_priority_field, has_queue_level_field, args.time_quantum if args.scheduler == "rr" else 0, **report_options)
+            if args.profile:
+                print_profile_report(profiler.summary())
+
+        if args.profile_json is not None:
+            profiler.write_json(args.profile_json)
+        return
+
+    if profiler is None and args.trace is None:
+        result = simulate(processes, scheduler_factory)
+    else:
+        simulator = Simulator(processes, scheduler_factory)
+        if profiler is not None:
+            profiler.attach(simulator)
+        trace_writers = follow_processors(args.trace, [simulator.processor]) if args.trace is not None else []
+        result = SimulationResult.from_simulator(simulator.run())
+        for trace_writer in trace_writers:
+            trace_writer.close()
+
+    if args.table_file is not None:
+        with open(args.table_file, "w", newline="") as table_file:
+            write_process_table_summary(result.processes, has_priority_field, has_queue_level_field, table_file, args.table_format)
+
+    if args.format == "json":
+        print(json.dumps({
+            "scheduler": result.scheduler_name,
+            "layers": layer_names,
+            "metrics": result.metrics(),
+            "processes": [{ "pid": p.pid, "arrival": p.arrival, "burst": p.burst, "priority": p.priority, "queue_level": p.queue_level + 1, "completion": p.completion, "turnaround": p.turnaround, "waiting": p.waiting } for p in result.processes],
+            "timeline": [{ "name": log.name, "start": log.start, "end": log.end, "tag": log.tag } for log in result.timeline],
+            **({ "profile": profiler.summary() } if args.profile else {}),
+        }))
+    else:
+        print_simulation_report(result, layer_names, has_priority_field, has_queue_level_field, args.time_quantum if args.scheduler == "rr" else 0, **report_options)
+        if args.profile:
+            print_profile_report(profiler.summary())
+
+    if args.profile_json is not None:
+        profiler.write_json(args.profile_json)
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        batch_main()
+    else:
+        main()
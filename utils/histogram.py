@@ -0,0 +1,117 @@
+import math
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+# Each power of two is split into this many buckets, which bounds the error of a percentile to about 1/32 = 3%
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+class LogHistogram:
+    """
+        Counts whole numbers that are at least 0 in logarithmic buckets, so that percentiles can be estimated
+        without keeping the values around. Small values get a bucket of their own, while larger values share
+        buckets that grow with their magnitude. Histograms of separate runs can be merged into one.
+    """
+
+    def __init__(self):
+        self.__buckets: Dict[int, int] = {}
+        self.__count: int = 0
+        self.__total: int = 0
+        self.__min: Optional[int] = None
+        self.__max: Optional[int] = None
+
+    @staticmethod
+    def __bucket_of(value: int):
+        """ Maps a value to its bucket. Values below two powers of the sub-buckets map to themselves. """
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value
+        return shift * SUB_BUCKETS + (value >> shift)
+
+    @staticmethod
+    def __bounds_of(bucket: int):
+        """ Retrieves the smallest and largest value that map to a bucket. """
+        if bucket < 2 * SUB_BUCKETS:
+            return bucket, bucket
+        shift, mantissa = divmod(bucket, SUB_BUCKETS)
+        shift -= 1
+        mantissa += SUB_BUCKETS
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def __len__(self):
+        return self.__count
+
+    @property
+    def total(self):
+        return self.__total
+
+    @property
+    def min(self):
+        return self.__min
+
+    @property
+    def max(self):
+        return self.__max
+
+    @property
+    def mean(self):
+        return self.__total / self.__count if self.__count > 0 else 0.0
+
+    def add(self, value: int):
+        """ Counts a value. """
+        if value < 0:
+            raise ValueError("Histograms only count values that are at least 0.")
+
+        bucket = self.__bucket_of(value)
+        self.__buckets[bucket] = self.__buckets.get(bucket, 0) + 1
+        self.__count += 1
+        self.__total += value
+        self.__min = value if self.__min is None or value < self.__min else self.__min
+        self.__max = value if self.__max is None or value > self.__max else self.__max
+
+    def extend(self, values: Iterable[int]):
+        """ Counts many values at once, which is quicker than adding them one by one. """
+        values = list(values)
+        if len(values) == 0:
+            return
+        if min(values) < 0:
+            raise ValueError("Histograms only count values that are at least 0.")
+
+        for bucket, bucket_count in Counter(map(self.__bucket_of, values)).items():
+            self.__buckets[bucket] = self.__buckets.get(bucket, 0) + bucket_count
+        self.__count += len(values)
+        self.__total += sum(values)
+        self.__min = min(values) if self.__min is None else min(self.__min, min(values))
+        self.__max = max(values) if self.__max is None else max(self.__max, max(values))
+
+    def merge(self, other: 'LogHistogram'):
+        """ Adds the counts of another histogram to this one. """
+        for bucket, bucket_count in other.__buckets.items():
+            self.__buckets[bucket] = self.__buckets.get(bucket, 0) + bucket_count
+
+        if other.__count > 0:
+            self.__min = other.__min if self.__min is None or other.__min < self.__min else self.__min
+            self.__max = other.__max if self.__max is None or other.__max > self.__max else self.__max
+        self.__count += other.__count
+        self.__total += other.__total
+
+        return self
+
+    def percentile(self, percent: float):
+        """ Estimates the value that the given percent of the counted values are at or below. It is None if nothing was counted. """
+        if self.__count == 0:
+            return None
+
+        rank = max(1, math.ceil(self.__count * percent / 100))
+        if rank >= self.__count:
+            return self.__max
+
+        seen = 0
+        for bucket in sorted(self.__buckets):
+            seen += self.__buckets[bucket]
+            if seen >= rank:
+                low, high = self.__bounds_of(bucket)
+                # The middle of a bucket is the closest guess, but it should never go past the values that were seen
+                return min(max((low + high) // 2, self.__min), self.__max)
+
+        return self.__max
@@ -1,4 +1,5 @@
-from typing import TypeVar, Generic, List, Callable
+from types import MethodType
+from typing import Any, TypeVar, Generic, List, Callable
 
 T = TypeVar('T')
 
@@ -6,19 +7,42 @@ class Signal(Generic[T]):
     """ A class that events signals to subscribed functions. """
 
     def __init__(self):
-        self.__subscribers: List[Callable[[T], None]]= []
+        self.__subscribers: List[Callable[..., None]]= []
 
-    def listen(self, fn: Callable[[T], None]):
+    def __getstate__(self):
+        """
+            Saves bound methods as their object and attribute name, since pickle looks methods up by their plain name,
+            which misses private methods whose names are mangled by their class.
+        """
+        return { "subscribers": [(fn.__self__, _attribute_name(fn)) if isinstance(fn, MethodType) else fn for fn in self.__subscribers] }
+
+    def __setstate__(self, state: Any):
+        """ Restores the subscriptions that were saved, binding methods to their restored objects again. """
+        self.__subscribers = [getattr(*fn) if isinstance(fn, tuple) else fn for fn in state["subscribers"]]
+
+    def __len__(self):
+        return len(self.__subscribers)
+
+    def listen(self, fn: Callable[..., None]):
         """ Subscribe a function to the signal, if it has not been subscribed. """
         if fn not in self.__subscribers:
             self.__subscribers.append(fn)
 
-    def ignore(self, fn: Callable[[T], None]):
+    def ignore(self, fn: Callable[..., None]):
         """ Remove a function's subscription from the signal. """
         if fn in self.__subscribers:
             self.__subscribers.remove(fn)
 
-    def emit(self, payload: T):
-        """ Emit the signal with a given payload to all subscribers. """
+    def emit(self, payload: T, *args: Any):
+        """ Emit the signal with a given payload, and any extra arguments, to all subscribers. """
         for fn in self.__subscribers:
-            fn(payload)
\ No newline at end of file
+            fn(payload, *args)
+
+
+def _attribute_name(method: MethodType):
+    """ Retrieves the name that a bound method is found under on its object, mangling it if it is private. """
+    name = method.__func__.__name__
+    if name.startswith("__") and not name.endswith("__"):
+        owner = method.__func__.__qualname__.rsplit(".", 2)[-2]
+        return "_" + owner.lstrip("_") + name
+    return name
@@ -0,0 +1,188 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Iterator, Optional, Tuple
+
+from models import ProcessTimeline
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A trace starts with a header of the magic bytes, the format version, and padding that keeps the records 8-byte aligned.
+# Each record is then a slice of the timeline, as little-endian 64-bit pid, start time, end time, and tag.
+TRACE_MAGIC = b"PTRC"
+TRACE_VERSION = 1
+HEADER = struct.Struct("<4sI8x")
+RECORD = struct.Struct("<qqqq")
+RECORD_FIELDS = ("pid", "start", "end", "tag")
+
+TRACE_DTYPE = np.dtype([(name, "<i8") for name in RECORD_FIELDS]) if np is not None else None
+
+class TraceWriter:
+    """
+        Writes the slices of an execution timeline to a binary trace file of fixed-width records, through a buffer that
+        is flushed every given number of records. A writer can follow a processor, so that slices are written while the
+        simulation runs, as soon as they can no longer be merged with the slice after them.
+    """
+
+    def __init__(self, path: str, buffer_records: int = 1 << 16):
+        if buffer_records < 1:
+            raise ValueError("The buffer should hold at least 1 record.")
+
+        self.__file = open(path, "wb")
+        self.__file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+        self.__buffer = array("q")
+        self.__buffer_size: int = buffer_records * len(RECORD_FIELDS)
+        self.__num_records: int = 0
+
+        self.__timeline: Optional[ProcessTimeline] = None
+        self.__num_followed: int = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+    @property
+    def num_records(self):
+        """ The number of records written so far, including those that are still buffered. """
+        return self.__num_records + len(self.__buffer) // len(RECORD_FIELDS)
+
+    def write(self, pid: int, start_time: int, end_time: int, tag: int):
+        """ Writes a slice of execution as one record. """
+        self.__buffer.extend((pid, start_time, end_time, tag))
+        if len(self.__buffer) >= self.__buffer_size:
+            self.flush()
+
+    def write_timeline(self, timeline: ProcessTimeline, start: int = 0, stop: Optional[int] = None):
+        """ Writes the slices of a timeline from a start index up to, but not including, a stop index. """
+        pids, starts, ends, tags = timeline.columns()
+        stop = len(timeline) if stop is None else stop
+        for idx in range(start, stop):
+            self.write(pids[idx], starts[idx], ends[idx], tags[idx])
+
+    def follow(self, processor: Any):
+        """
+            Writes the slices of a processor as they are recorded. The last slice is written once the writer is closed.
+            Any processor with a process_dump timeline, and on_load and on_clear signals, can be followed.
+        """
+        self.__timeline = processor.process_dump
+        self.__num_followed = len(self.__timeline)
+        processor.on_load(self.write_settled_slices)
+        processor.on_clear(self.write_settled_slices)
+
+    def write_settled_slices(self, process: Any = None):
+        """ Writes the slices of the followed timeline except for its last, which may still be merged with the next slice. Listens to the processor. """
+        if self.__timeline is not None and len(self.__timeline) - 1 > self.__num_followed:
+            self.write_timeline(self.__timeline, self.__num_followed, len(self.__timeline) - 1)
+            self.__num_followed = len(self.__timeline) - 1
+
+    def flush(self):
+        """ Writes the buffered records to the file. """
+        if sys.byteorder == "big":
+            self.__buffer.byteswap()
+        self.__buffer.tofile(self.__file)
+        self.__num_records += len(self.__buffer) // len(RECORD_FIELDS)
+        del self.__buffer[:]
+        self.__file.flush()
+
+    def close(self):
+        """ Writes what is left of the followed timeline and the buffer, and closes the file. """
+        if self.__file.closed:
+            return
+
+        if self.__timeline is not None:
+            self.write_timeline(self.__timeline, self.__num_followed)
+            self.__num_followed = len(self.__timeline)
+        self.flush()
+        self.__file.close()
+
+def write_trace(path: str, timeline: ProcessTimeline):
+    """ Writes a whole timeline to a binary trace file, and returns the number of records written. """
+    with TraceWriter(path) as writer:
+        writer.write_timeline(timeline)
+        return writer.num_records
+
+class TraceReader:
+    """
+        Reads a binary trace file through a memory map, so that records are only read from the file when they are used.
+        With NumPy installed, the records can be viewed as arrays without copying them, which can be sliced and
+        aggregated without creating a Python object per slice. Views should be dropped before the reader is closed.
+    """
+
+    def __init__(self, path: str):
+        self.__file = open(path, "rb")
+        try:
+            magic, version = HEADER.unpack(self.__file.read(HEADER.size))
+        except struct.error:
+            self.__file.close()
+            raise ValueError("{}: the file is too short to be a trace.".format(path)) from None
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            self.__file.close()
+            raise ValueError("{}: the file is not a trace of version {}.".format(path, TRACE_VERSION))
+
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        # A record that was cut off by a run that was stopped mid-write is left out
+        self.__num_records: int = (len(self.__mmap) - HEADER.size) // RECORD.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+    def __len__(self):
+        return self.__num_records
+
+    def __getitem__(self, idx: int) -> Tuple[int, int, int, int]:
+        """ Retrieves the pid, start time, end time, and tag of a record. """
+        if idx < 0:
+            idx += self.__num_records
+        if not 0 <= idx < self.__num_records:
+            raise IndexError("The trace has no record at {}.".format(idx))
+        return RECORD.unpack_from(self.__mmap, HEADER.size + idx * RECORD.size)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int]]:
+        return RECORD.iter_unpack(memoryview(self.__mmap)[HEADER.size:HEADER.size + self.__num_records * RECORD.size])
+
+    def __bisect(self, field: int, time: int):
+        """ Finds the index of the first record whose field is past a time. Records are in order of time, so this is a binary search. """
+        low, high = 0, self.__num_records
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from("<q", self.__mmap, HEADER.size + middle * RECORD.size + field * 8)[0] <= time:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def window(self, start_time: int, end_time: int):
+        """ Retrieves the range of indices of the records that overlap the time from the start up to, but not including, the end. """
+        if end_time <= start_time:
+            return range(0)
+        return range(self.__bisect(RECORD_FIELDS.index("end"), start_time), self.__bisect(RECORD_FIELDS.index("start"), end_time - 1))
+
+    def records(self):
+        """ Views every record as a NumPy structured array with the fields pid, start, end, and tag, without copying the file. """
+        if np is None:
+            raise ImportError("Viewing a trace as arrays needs NumPy to be installed.")
+        return np.frombuffer(self.__mmap, dtype=TRACE_DTYPE, count=self.__num_records, offset=HEADER.size)
+
+    def column(self, name: str):
+        """ Views a field of every record as a NumPy array, without copying the file. """
+        if name not in RECORD_FIELDS:
+            raise ValueError("Traces have no {} field.".format(name))
+        return self.records()[name]
+
+    def to_timeline(self):
+        """ Loads the records back into a timeline. """
+        pids, starts, ends, tags = zip(*self) if self.__num_records > 0 else ((), (), (), ())
+        return ProcessTimeline.from_columns(pids, starts, ends, tags)
+
+    def close(self):
+        self.__mmap.close()
+        self.__file.close()
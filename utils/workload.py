@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator
+
+from models import Process, ProcessTable
+
+WORKLOAD_FIELDS = ["pid", "arrival", "burst", "priority", "queue_level"]
+
+def _process_from_record(record: Dict[str, Any], line_num: int, path: str):
+    """ Creates a process from a workload record. Queue levels in a workload start at 1, just like in the prompts. """
+    try:
+        pid = int(record["pid"])
+        arrival_time = int(record["arrival"])
+        burst_time = int(record["burst"])
+        priority = int(record["priority"]) if record.get("priority") not in (None, "") else 1
+        queue_level = int(record["queue_level"]) if record.get("queue_level") not in (None, "") else 1
+    except KeyError as e:
+        raise ValueError("{}:{}: missing the {} field.".format(path, line_num, e)) from None
+    except (TypeError, ValueError):
+        raise ValueError("{}:{}: fields should be whole numbers.".format(path, line_num)) from None
+
+    if arrival_time < 0 or burst_time < 1 or queue_level < 1:
+        raise ValueError("{}:{}: arrival should be at least 0, while burst and queue_level should be at least 1.".format(path, line_num))
+
+    return Process(pid, arrival_time, burst_time, priority, queue_level - 1)
+
+def read_workload(path: str) -> Iterator[Process]:
+    """
+        Lazily reads the processes of a workload file, which is either a CSV file with a header row,
+        or a JSON Lines file with one object per line. Both use the fields pid, arrival, burst, and
+        optionally priority and queue_level.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, newline="") as file:
+        if extension == ".csv":
+            # Line 1 is the header
+            for line_num, record in enumerate(csv.DictReader(file), start=2):
+                yield _process_from_record(record, line_num, path)
+        elif extension in (".jsonl", ".ndjson"):
+            for line_num, line in enumerate(file, start=1):
+                if line.strip():
+                    yield _process_from_record(json.loads(line), line_num, path)
+        else:
+            raise ValueError("{}: workloads should be a .csv or a .jsonl file.".format(path))
+
+def load_workload(path: str):
+    """ Loads the processes of a workload file into a process table. """
+    return ProcessTable.from_processes(read_workload(path))
+
+def write_workload(path: str, processes: Iterable[Any]):
+    """
+        Writes processes one at a time into a workload file, in the same formats that are read by read_workload,
+        so that generated workloads can be saved without holding them in memory. It returns the number of processes written.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".csv", ".jsonl", ".ndjson"):
+        raise ValueError("{}: workloads should be a .csv or a .jsonl file.".format(path))
+
+    num_processes = 0
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file) if extension == ".csv" else None
+        if writer is not None:
+            writer.writerow(WORKLOAD_FIELDS)
+
+        for p in processes:
+            fields = [p.pid, p.arrival, p.burst, p.priority, p.queue_level + 1]
+            if writer is not None:
+                writer.writerow(fields)
+            else:
+                file.write(json.dumps(dict(zip(WORKLOAD_FIELDS, fields))) + "\n")
+            num_processes += 1
+
+    return num_processes
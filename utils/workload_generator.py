@@ -0,0 +1,140 @@
+from abc import ABC, abstractmethod
+from itertools import accumulate, count
+from random import Random
+from typing import Dict, Iterator, Optional
+
+from models import Process
+
+class Distribution(ABC):
+    """ A source of random values, which draws from the random generator of a workload so that runs can be seeded. """
+
+    @abstractmethod
+    def sample(self, rng: Random) -> float:
+        """ Draws the next value. """
+        pass
+
+    def reset(self):
+        """ Forgets any state kept between samples, so that a new workload starts from scratch. """
+        pass
+
+class PoissonArrivals(Distribution):
+    """ Time between arrivals of a Poisson process, where processes arrive at a steady average rate per time unit. """
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("The arrival rate should be more than 0.")
+        self.__rate: float = rate
+
+    def sample(self, rng: Random):
+        return rng.expovariate(self.__rate)
+
+class BurstyArrivals(Distribution):
+    """
+        Time between arrivals that alternate between calm periods at the base rate, and bursts at the burst rate.
+        The lengths of the periods are counted in arrivals, and are geometrically distributed around their means.
+    """
+
+    def __init__(self, rate: float, burst_rate: float, mean_calm_length: float = 50, mean_burst_length: float = 10):
+        if rate <= 0 or burst_rate <= 0:
+            raise ValueError("The arrival rates should be more than 0.")
+        if mean_calm_length < 1 or mean_burst_length < 1:
+            raise ValueError("The mean lengths of the periods should be at least 1.")
+
+        self.__rates = (rate, burst_rate)
+        self.__switch_probabilities = (1 / mean_calm_length, 1 / mean_burst_length)
+        self.__is_bursting: bool = False
+
+    def sample(self, rng: Random):
+        if rng.random() < self.__switch_probabilities[self.__is_bursting]:
+            self.__is_bursting = not self.__is_bursting
+        return rng.expovariate(self.__rates[self.__is_bursting])
+
+    def reset(self):
+        self.__is_bursting = False
+
+class ExponentialBursts(Distribution):
+    """ Burst times that are mostly short, with an exponentially thinning tail of longer ones. """
+
+    def __init__(self, mean: float):
+        if mean <= 0:
+            raise ValueError("The mean burst time should be more than 0.")
+        self.__mean: float = mean
+
+    def sample(self, rng: Random):
+        return rng.expovariate(1 / self.__mean)
+
+class ParetoBursts(Distribution):
+    """ Heavy-tailed burst times starting from a minimum, where a few long processes take up much of the processor. """
+
+    def __init__(self, shape: float, minimum: float = 1):
+        if shape <= 0 or minimum <= 0:
+            raise ValueError("The shape and minimum of the burst times should be more than 0.")
+        self.__shape: float = shape
+        self.__minimum: float = minimum
+
+    def sample(self, rng: Random):
+        return self.__minimum * rng.paretovariate(self.__shape)
+
+class BimodalBursts(Distribution):
+    """ A mix of short, interactive burst times and long, batch burst times, which are each exponentially distributed. """
+
+    def __init__(self, short_mean: float, long_mean: float, long_fraction: float = 0.2):
+        if short_mean <= 0 or long_mean <= 0:
+            raise ValueError("The mean burst times should be more than 0.")
+        if not 0 <= long_fraction <= 1:
+            raise ValueError("The fraction of long burst times should be between 0 and 1.")
+
+        self.__short_mean: float = short_mean
+        self.__long_mean: float = long_mean
+        self.__long_fraction: float = long_fraction
+
+    def sample(self, rng: Random):
+        mean = self.__long_mean if rng.random() < self.__long_fraction else self.__short_mean
+        return rng.expovariate(1 / mean)
+
+class WorkloadGenerator:
+    """
+        Lazily generates synthetic processes, whose arrivals, burst times, priorities, and queue levels are drawn from
+        the given distributions and mixes. Mixes map values to their relative weights, and queue levels start at 1 just
+        like in workload files. Generating with the same seed always yields the same processes.
+    """
+
+    def __init__(self, arrivals: Distribution, bursts: Distribution, priorities: Dict[int, float] = { 1: 1 }, queue_levels: Dict[int, float] = { 1: 1 }, seed: Optional[int] = None):
+        if any(level < 1 for level in queue_levels):
+            raise ValueError("Queue levels should be at least 1.")
+        if any(weight < 0 for weight in list(priorities.values()) + list(queue_levels.values())) or sum(priorities.values()) <= 0 or sum(queue_levels.values()) <= 0:
+            raise ValueError("The weights of a mix should not be negative, and at least one should be more than 0.")
+
+        self.__arrivals: Distribution = arrivals
+        self.__bursts: Distribution = bursts
+        self.__priorities = list(priorities.keys())
+        self.__priority_weights = list(accumulate(priorities.values()))
+        self.__queue_levels = list(queue_levels.keys())
+        self.__queue_level_weights = list(accumulate(queue_levels.values()))
+        self.__seed: Optional[int] = seed
+
+    @property
+    def seed(self):
+        return self.__seed
+
+    def generate(self, num_processes: Optional[int] = None) -> Iterator[Process]:
+        """
+            Yields processes in order of arrival, with pids starting from 1. It never stops if no number of processes
+            is given, so such a stream should be fed straight into a Simulator, which admits the processes as they
+            arrive. Streams of a given number of processes can also be compacted with ProcessTable.from_processes.
+        """
+        rng = Random(self.__seed)
+        self.__arrivals.reset()
+        self.__bursts.reset()
+        pids = count(1) if num_processes is None else range(1, num_processes + 1)
+        time = 0.0
+
+        for pid in pids:
+            # Processes arrive at whole time units, and always burst for at least one
+            arrival_time = int(time)
+            burst_time = max(1, round(self.__bursts.sample(rng)))
+            priority = rng.choices(self.__priorities, cum_weights=self.__priority_weights)[0]
+            queue_level = rng.choices(self.__queue_levels, cum_weights=self.__queue_level_weights)[0]
+
+            yield Process(pid, arrival_time, burst_time, priority, queue_level - 1)
+            time += self.__arrivals.sample(rng)
@@ -0,0 +1,168 @@
+import sys
+import argparse
+from random import Random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from models import Process, ProcessTable, IDLE_PID
+from modules import SimulationResult, simulate
+import modules.analytic as analytic
+from modules.analytic import ANALYTIC_SCHEDULERS, is_supported
+from modules.smp import BALANCING_MODES, SMPSimulationResult, simulate_smp
+from modules.schedulers import FCFS, SJF, PriorityNP, Priority, RoundRobin, SRTF, MLQ, MLFQ
+
+SUITES = ("analytic", "smp")
+
+# Schedulers of every kind, including the preemptive and multilevel ones whose processes are moved around the most
+SMP_FACTORIES = [
+    ("FCFS", FCFS.factory()),
+    ("SJF", SJF.factory()),
+    ("PriorityNP", PriorityNP.factory()),
+    ("Priority", Priority.factory()),
+    ("SRTF", SRTF.factory()),
+    ("RoundRobin", RoundRobin.factory(3, True)),
+    ("MLQ", MLQ.factory([RoundRobin.factory(2), FCFS.factory(), SRTF.factory()])),
+    ("MLFQ", MLFQ.factory([2, 4], FCFS.factory())),
+]
+CORE_COUNTS = (2, 3, 5)
+
+# A check runs one case, and returns the problems that it found with it
+Check = Tuple[str, Callable[[], List[str]]]
+
+def create_processes(rng: Random):
+    """ Generates a small workload, whose arrivals are bunched up or spread out, and whose queue levels fit a three level MLQ. """
+    spread = rng.choice([0, 3, 10, 40, 200])
+    max_burst = rng.choice([3, 10, 30])
+    return [Process(pid, rng.randint(0, spread), rng.randint(1, max_burst), rng.randint(1, 4), rng.randint(0, 2)) for pid in range(1, rng.randint(1, 30) + 1)]
+
+def describe_run(result: SimulationResult):
+    """ Retrieves everything that a run on one core produces, so that two runs can be compared. """
+    return {
+        "timeline": [(log.name, log.start, log.end, log.tag) for log in result.timeline],
+        "processes": [(p.pid, p.completion, p.turnaround, p.waiting, p.response, p.first_dispatch, p.state, p.burst_remaining) for p in result.processes],
+        "metrics": { "scheduler": result.scheduler_name, **result.metrics() },
+    }
+
+def analytic_checks(num_workloads: int, seed: int) -> List[Check]:
+    """
+        Runs generated workloads through the schedulers whose runs are computed with NumPy, both with NumPy and through
+        the simulator, as lists and as tables of processes. Workloads with repeated pids and negative priorities are
+        mixed in, since ties are broken by them.
+    """
+    rng = Random(seed)
+    checks: List[Check] = []
+    for num in range(num_workloads):
+        processes = create_processes(rng)
+        if rng.random() < 0.3:
+            processes = [Process(rng.randint(1, 5), p.arrival, p.burst, rng.randint(-2, 4), p.queue_level) for p in processes]
+        workload = [(p.pid, p.arrival, p.burst, p.priority, p.queue_level) for p in processes]
+
+        for scheduler in ANALYTIC_SCHEDULERS:
+            for as_table in (False, True):
+                def check(workload: Any = workload, factory: Any = scheduler.factory(), as_table: bool = as_table):
+                    def create():
+                        processes = [Process(*fields) for fields in workload]
+                        return ProcessTable.from_processes(processes) if as_table else processes
+
+                    processes = create()
+                    if not is_supported(processes, factory):
+                        return ["the run is not computed with NumPy, which should be installed for this suite"]
+
+                    computed, simulated = describe_run(simulate(processes, factory)), describe_run(simulate(create(), factory, allow_analytic=False))
+                    return ["the computed {} differs from the simulated one".format(key) for key in computed if computed[key] != simulated[key]]
+
+                checks.append(("analytic/{} workload={} table={}".format(scheduler.__name__, num, as_table), check))
+
+    return checks
+
+def smp_problems(result: SMPSimulationResult, processes: List[Process]):
+    """
+        Checks that the timeline of every core is made of non-empty slices that follow each other up to the end of the
+        run, and that each process ran for exactly its burst, on one core at a time, from its first dispatch to its completion.
+    """
+    problems: List[str] = []
+    slices: Dict[int, List[Tuple[int, int]]] = {}
+
+    for core_num, timeline in enumerate(result.timelines):
+        pids, starts, ends, _ = timeline.columns()
+        last_end = 0
+        for pid, start, end in zip(pids, starts, ends):
+            if start >= end:
+                problems.append("core {} has an empty slice of {} at {}".format(core_num, pid, start))
+            if start != last_end:
+                problems.append("core {} has a gap or overlap at {}".format(core_num, start))
+            last_end = end
+            if pid != IDLE_PID:
+                slices.setdefault(pid, []).append((start, end))
+
+        if last_end != result.total_run_time:
+            problems.append("core {} ends at {} rather than {}".format(core_num, last_end, result.total_run_time))
+
+    for process in processes:
+        runs = sorted(slices.get(process.pid, []))
+        if process.completion is None or len(runs) == 0:
+            problems.append("process {} was not completed".format(process.pid))
+            continue
+
+        if sum(end - start for start, end in runs) != process.burst:
+            problems.append("process {} did not run for exactly its burst".format(process.pid))
+        if any(earlier[1] > later[0] for earlier, later in zip(runs, runs[1:])):
+            problems.append("process {} ran on more than one core at once".format(process.pid))
+        if runs[0][0] != process.first_dispatch or runs[-1][1] != process.completion or process.first_dispatch < process.arrival:
+            problems.append("process {} has times that do not match its slices".format(process.pid))
+
+    return problems
+
+def smp_checks(num_workloads: int, seed: int) -> List[Check]:
+    """ Runs generated workloads through every scheduler over many cores, with every balancing mode that the scheduler supports. """
+    rng = Random(seed)
+    checks: List[Check] = []
+    for num in range(num_workloads):
+        workload = [(p.pid, p.arrival, p.burst, p.priority, p.queue_level) for p in create_processes(rng)]
+
+        for name, factory in SMP_FACTORIES:
+            for balancing in BALANCING_MODES:
+                is_global_supported = factory.func not in (MLQ, MLFQ) and not factory.func.preempts_on_arrival
+                if balancing == "global" and not is_global_supported:
+                    continue
+
+                for num_cores in CORE_COUNTS:
+                    def check(workload: Any = workload, factory: Any = factory, num_cores: int = num_cores, balancing: str = balancing):
+                        processes = [Process(*fields) for fields in workload]
+                        return smp_problems(simulate_smp(processes, factory, num_cores, balancing, balance_interval=3), processes)
+
+                    checks.append(("smp/{} workload={} cores={} balancing={}".format(name, num, num_cores, balancing), check))
+
+    return checks
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="verify.py",
+        description="Checks the simulators against each other and against what should hold of any run, on seeded, generated workloads.",
+    )
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES), help="suites to run (defaults to all of them)")
+    parser.add_argument("--workloads", type=int, default=50, help="number of generated workloads per suite")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the generated workloads")
+    args = parser.parse_args(argv)
+
+    checks: List[Check] = []
+    if "analytic" in args.suites:
+        if analytic.np is None:
+            print("Skipping the analytic suite, since NumPy is not installed.", file=sys.stderr)
+        else:
+            checks += analytic_checks(args.workloads, args.seed)
+    if "smp" in args.suites:
+        checks += smp_checks(args.workloads, args.seed)
+
+    num_failed = 0
+    for label, check in checks:
+        problems = check()
+        if len(problems) > 0:
+            num_failed += 1
+            print("{}: {}".format(label, "; ".join(problems)), file=sys.stderr)
+
+    print("{} of {} checks failed.".format(num_failed, len(checks)))
+    if num_failed > 0:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
 from .view import View
-from .table import TableView
+from .table import TableView, TableWriter
 from .gantt import GanttView
\ No newline at end of file
@@ -1,38 +1,127 @@
-from typing import List
+import shutil
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+from models import ProcessTimeline, IDLE_PID
 from views import View
 
 class GanttView(View):
     def __init__(self, name: str = "", show_timestamps: bool = True, min_cell_width: int = 4, start_time: int = 0):
         super().__init__(min_cell_width)
-        self.__name: str = name 
-        self.__show_timestamps: bool = show_timestamps 
+        self.__name: str = name
+        self.__show_timestamps: bool = show_timestamps
         self.__start_time: int = start_time
-        
+
         self.__labels: List[str] = []
         self.__timestamps: List[int] = []
 
+    @classmethod
+    def from_timeline(cls, timeline: ProcessTimeline, start_time: Optional[int] = None, end_time: Optional[int] = None, tag: Optional[int] = None, name: str = "", show_timestamps: bool = True, min_cell_width: int = 4):
+        """
+            Charts the slices of a timeline that overlap a window of time, clipped to the window. The slices in the
+            window are found by a binary search, so only they are looked at. If a tag is given, the slices with other
+            tags are left blank, just like the layers of a multilevel queue.
+        """
+        pids, starts, ends, tags = timeline.columns()
+        start_time = (starts[0] if len(timeline) > 0 else 0) if start_time is None else start_time
+        gantt = cls(name, show_timestamps, min_cell_width, start_time)
+
+        first = bisect_right(ends, start_time)
+        last = len(timeline) if end_time is None else bisect_left(starts, end_time)
+        for idx in range(first, last):
+            label = "idle" if pids[idx] == IDLE_PID else str(pids[idx])
+            gantt.add_item(label if tag is None or tags[idx] == tag else "", ends[idx] if end_time is None else min(ends[idx], end_time))
+
+        return gantt
+
+    @classmethod
+    def from_timeline_buckets(cls, timeline: ProcessTimeline, bucket_size: int, start_time: Optional[int] = None, end_time: Optional[int] = None, name: str = "", show_timestamps: bool = True, min_cell_width: int = 4):
+        """
+            Charts a zoomed out view of a timeline, where the time is split into buckets of a fixed size. Each bucket
+            shows the process that ran the longest in it, along with the percent of the bucket that the processor was busy.
+        """
+        if bucket_size < 1:
+            raise ValueError("Buckets should be at least 1 time unit long.")
+
+        pids, starts, ends, _ = timeline.columns()
+        start_time = (starts[0] if len(timeline) > 0 else 0) if start_time is None else start_time
+        end_time = (ends[-1] if len(timeline) > 0 else start_time) if end_time is None else end_time
+        gantt = cls(name, show_timestamps, min_cell_width, start_time)
+
+        idx = bisect_right(ends, start_time)
+        for bucket_start in range(start_time, end_time, bucket_size):
+            bucket_end = min(bucket_start + bucket_size, end_time)
+            busy_times: Dict[int, int] = {}
+
+            # Slices that go past the bucket are looked at again by the next bucket
+            while idx < len(timeline) and starts[idx] < bucket_end:
+                if pids[idx] != IDLE_PID:
+                    busy_times[pids[idx]] = busy_times.get(pids[idx], 0) + min(ends[idx], bucket_end) - max(starts[idx], bucket_start)
+                if ends[idx] > bucket_end:
+                    break
+                idx += 1
+
+            if len(busy_times) > 0:
+                dominant_pid = max(busy_times, key=busy_times.__getitem__)
+                utilization = sum(busy_times.values()) * 100 // (bucket_end - bucket_start)
+                gantt.add_item("{} {}%".format(dominant_pid, utilization), bucket_end)
+            else:
+                gantt.add_item("idle", bucket_end)
+
+        return gantt
 
     def __str__(self):
-        gantt = ""
-        
-        name_padding = " " * (len(self.__name) + 1) if self.__name else "" 
-        name = self.__name + " " if self.__name else "" 
-        sep_line = name_padding + self._create_separator_line()
-
-        gantt += sep_line + "\n"
-        gantt += name + self._format_row(self.__labels) + "\n"
-        gantt += sep_line
-        
+        return self.__render(0, len(self.__labels))
+
+    def __render(self, first: int, last: int):
+        """ Renders the items from the first up to, but not including, the last, starting from the timestamp before them. """
+        cell_widths = self._cell_widths[first:last]
+        start_time = self.__timestamps[first - 1] if first > 0 else self.__start_time
+
+        name_padding = " " * (len(self.__name) + 1) if self.__name else ""
+        name = self.__name + " " if self.__name else ""
+        sep_line = name_padding + self._create_separator_line(cell_widths=cell_widths)
+
+        lines = [sep_line, name + self._format_row(self.__labels[first:last], cell_widths=cell_widths), sep_line]
         if self.__show_timestamps:
-            gantt += "\n" + name_padding + str(self.__start_time) + self._format_row(self.__timestamps, sep=" ")
-        
-        return gantt
+            lines.append(name_padding + str(start_time) + self._format_row(self.__timestamps[first:last], sep=" ", cell_widths=cell_widths))
+
+        return "\n".join(lines)
+
+    def page_breaks(self, width: int):
+        """ Finds where each page of the chart starts, so that no line of a page is wider than the given width, unless a single item is. """
+        name_width = len(self.__name) + 1 if self.__name else 0
+        breaks: List[int] = [0]
+        # A page is as wide as its cells and their separators, and its timestamp row starts with the time before them
+        line_width = name_width + 1 + (len(str(self.__start_time)) if self.__show_timestamps else 0)
+
+        for idx, cell_width in enumerate(self._cell_widths[:len(self.__labels)]):
+            if idx > breaks[-1] and line_width + cell_width + 1 > width:
+                breaks.append(idx)
+                line_width = name_width + 1 + (len(str(self.__timestamps[idx - 1])) if self.__show_timestamps else 0)
+            line_width += cell_width + 1
+
+        return breaks
+
+    def pages(self, width: Optional[int] = None, breaks: Optional[List[int]] = None):
+        """
+            Splits the chart into pages that fit the given width, which defaults to the width of the terminal.
+            The breaks of another chart can be given, so that charts that are shown together are split the same way.
+        """
+        if breaks is None:
+            breaks = self.page_breaks(width if width is not None else shutil.get_terminal_size().columns)
+        return [self.__render(first, last) for first, last in zip(breaks, breaks[1:] + [len(self.__labels)])]
 
     def add_item(self, name: str, time: int):
         self._adjust_cell_size_at(len(self.__labels), name)
+        # Large times would otherwise spill out of their cells and shift the timestamps after them
+        self._adjust_cell_size_at(len(self.__labels), time)
         self.__labels.append(name)
         self.__timestamps.append(time)
         return self
 
-    def render(self):
-        print(self)
+    def render(self, width: Optional[int] = None, breaks: Optional[List[int]] = None):
+        """ Renders the whole chart, or splits it into pages if a width or page breaks are given. """
+        if width is None and breaks is None:
+            print(self)
+        else:
+            print("\n\n".join(self.pages(width, breaks)))
@@ -1,4 +1,7 @@
-from typing import List, Any
+import csv
+import sys
+from itertools import chain
+from typing import List, Any, Iterable, Optional, TextIO
 from views import View
 
 class TableView(View):
@@ -8,35 +11,147 @@ class TableView(View):
         self.__header: List[str] = header
         self.__footer: List[str] = footer
 
-        if len(header) > 0: 
+        if len(header) > 0:
             self._adjust_cell_sizes_to_fit(*header)
-        if len(footer) > 0: 
+        if len(footer) > 0:
             self._adjust_cell_sizes_to_fit(*footer)
 
     def __str__(self):
-        table = ""
         sep_line = self._create_separator_line()
+        lines: List[str] = []
 
         if len(self.__header) > 0:
-            table += sep_line + "\n"
-            table += self._format_row(self.__header) + "\n"
-
-        table += sep_line + "\n"
-        for data in self.__data:
-            table += self._format_row(data) + "\n"
-        table += sep_line
-        
+            lines.append(sep_line)
+            lines.append(self._format_row(self.__header))
+
+        lines.append(sep_line)
+        lines.extend(self._format_row(data) for data in self.__data)
+        lines.append(sep_line)
+
         if len(self.__footer) > 0:
-            table += "\n"
-            table += self._format_row(self.__footer) + "\n"
-            table += sep_line
-        
-        return table
-    
+            lines.append(self._format_row(self.__footer))
+            lines.append(sep_line)
+
+        return "\n".join(lines)
+
     def add_item(self, *data: Any):
         self._adjust_cell_sizes_to_fit(*data)
         self.__data.append(list(data))
         return self
-    
+
     def render(self):
         print(self)
+
+class TableWriter(View):
+    """
+        Writes a table to a file row by row as the rows are added, rather than holding every row until it is rendered.
+        The widths of the columns are either given up front (e.g. fit to the rows in a first pass with fit_widths), or
+        fit to a sample of the first rows, which are held back until the sample is full. Rows after the sample that are
+        wider than their columns push the cells after them out of line. Tables can also be written as CSV or TSV,
+        which need no widths at all. Rendering the writer finishes the table.
+    """
+
+    FORMATS = ("text", "csv", "tsv")
+
+    def __init__(self, file: Optional[TextIO] = None, min_cell_width: int = 5, header: List[str] = [], footer: List[str] = [], cell_widths: Optional[List[int]] = None, sample_size: int = 1000, format: str = "text"):
+        super().__init__(min_cell_width)
+        if format not in self.FORMATS:
+            raise ValueError("Tables are written as one of: {}.".format(", ".join(self.FORMATS)))
+
+        self.__file: TextIO = file if file is not None else sys.stdout
+        self.__header: List[str] = header
+        self.__footer: List[str] = footer
+        self.__format: str = format
+        self.__sample_size: int = sample_size
+        self.__sample: List[List[Any]] = []
+        self.__has_started: bool = False
+        self.__is_finished: bool = False
+
+        if cell_widths is not None:
+            self._cell_widths = list(cell_widths)
+        if len(header) > 0:
+            self._adjust_cell_sizes_to_fit(*header)
+        if len(footer) > 0:
+            self._adjust_cell_sizes_to_fit(*footer)
+
+        self.__csv_writer = csv.writer(self.__file, delimiter="\t" if format == "tsv" else ",", lineterminator="\n") if format != "text" else None
+        if self.__csv_writer is not None or cell_widths is not None:
+            self.__start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.render()
+
+    @staticmethod
+    def fit_widths(rows: Iterable[Iterable[Any]], min_cell_width: int = 5, header: List[str] = [], footer: List[str] = []):
+        """ Fits the widths of the columns to every row in a first pass, so that the rows can be written without a sample. """
+        cell_widths: List[int] = []
+        for row in chain([header, footer], rows):
+            for col, content in enumerate(row):
+                if col == len(cell_widths):
+                    cell_widths.append(min_cell_width)
+                cell_widths[col] = max(len(str(content)), cell_widths[col])
+
+        return cell_widths
+
+    def __start(self):
+        """ Writes the header, which fixes the widths of the columns. """
+        self.__has_started = True
+
+        if self.__csv_writer is not None:
+            if len(self.__header) > 0:
+                self.__csv_writer.writerow(self.__header)
+            return
+
+        sep_line = self._create_separator_line()
+        if len(self.__header) > 0:
+            self.__file.write(sep_line + "\n")
+            self.__file.write(self._format_row(self.__header) + "\n")
+        self.__file.write(sep_line + "\n")
+
+    def __write_sample(self):
+        """ Fits the widths of the columns to the sample, and writes the rows that were held back. """
+        for data in self.__sample:
+            self._adjust_cell_sizes_to_fit(*data)
+        self.__start()
+
+        self.__file.writelines(self._format_row(data) + "\n" for data in self.__sample)
+        self.__sample = []
+
+    def add_item(self, *data: Any):
+        if self.__is_finished:
+            raise ValueError("Rows can not be added to a table that was rendered.")
+
+        if self.__csv_writer is not None:
+            self.__csv_writer.writerow(data)
+        elif self.__has_started:
+            self.__file.write(self._format_row(list(data)) + "\n")
+        else:
+            self.__sample.append(list(data))
+            if len(self.__sample) >= self.__sample_size:
+                self.__write_sample()
+
+        return self
+
+    def render(self):
+        """ Finishes the table by writing the rows that are still held back and the footer. """
+        if self.__is_finished:
+            return
+        self.__is_finished = True
+
+        if self.__csv_writer is not None:
+            if len(self.__footer) > 0:
+                self.__csv_writer.writerow(self.__footer)
+        else:
+            if not self.__has_started:
+                self.__write_sample()
+
+            sep_line = self._create_separator_line()
+            self.__file.write(sep_line + "\n")
+            if len(self.__footer) > 0:
+                self.__file.write(self._format_row(self.__footer) + "\n")
+                self.__file.write(sep_line + "\n")
+
+        self.__file.flush()
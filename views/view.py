@@ -1,4 +1,4 @@
-from typing import Any, Iterable, List
+from typing import Any, Iterable, List, Optional
 from abc import ABC, abstractmethod
 
 class View(ABC):
@@ -21,21 +21,22 @@ class View(ABC):
         for col, c in enumerate(content):
             self._cell_widths[col] = max(len(str(c)), self._cell_widths[col])
     
-    def _format_row(self, items: List[Any], sep: str = "|"):
+    def _format_row(self, items: List[Any], sep: str = "|", cell_widths: Optional[List[int]] = None):
         """ 
             Formats a list of items to a row of formatted cells that are contained in a 
-            fixed cell width, and are separated by a given separator. 
+            fixed cell width, and are separated by a given separator. The cell widths of
+            the view are used, unless the widths of a part of the view are given.
         """
 
         row = ""
         row += sep
-        row += sep.join("{:>{}}".format(str(item), cell_width) for item, cell_width in zip(items, self._cell_widths)) 
+        row += sep.join("{:>{}}".format(str(item), cell_width) for item, cell_width in zip(items, self._cell_widths if cell_widths is None else cell_widths)) 
         row += sep
 
         return row
 
-    def _create_separator_line(self, joint: str = "+", line: str = "-"):
-        return joint + joint.join(line * w for w in self._cell_widths) + joint
+    def _create_separator_line(self, joint: str = "+", line: str = "-", cell_widths: Optional[List[int]] = None):
+        return joint + joint.join(line * w for w in (self._cell_widths if cell_widths is None else cell_widths)) + joint
     
     @staticmethod
     def numbered_list(items_iter: Iterable[Any], start_at: int = 1, is_reversed: bool = False):